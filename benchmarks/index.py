@@ -0,0 +1,92 @@
+"""Benchmark RuleIndex on a large population of rules.
+
+    python benchmarks/index.py [--rules N] [--queries N] [--window MINUTES]
+
+Builds an index of mixed rules (daily and weekly meetings, bounded
+campaigns, hourly jobs and rulesets of single dates), then times the
+queries of random windows and reports how many candidates survive pruning.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+
+from dateutil.rrule import DAILY, HOURLY, MONTHLY, WEEKLY, rrule, rruleset
+
+from rrule34.index import RuleIndex
+
+START = datetime(2020, 1, 1)
+
+
+def make_rule(random):
+    kind = random.random()
+    dtstart = START + timedelta(
+        days=random.randrange(365), hours=random.randrange(7, 20),
+        minutes=random.randrange(0, 60, 5))
+    if kind < .6:
+        return rrule(
+            random.choice((DAILY, WEEKLY)), dtstart=dtstart,
+            byweekday=random.sample(range(5), random.randrange(1, 4)))
+    if kind < .8:
+        return rrule(
+            random.choice((DAILY, MONTHLY)), dtstart=dtstart,
+            until=dtstart + timedelta(days=random.randrange(1, 400)))
+    if kind < .9:
+        return rrule(
+            HOURLY, dtstart=dtstart, byminute=random.randrange(60),
+            byhour=range(random.randrange(12), 24))
+    rrs = rruleset()
+    for _ in range(random.randrange(1, 4)):
+        rrs.rdate(dtstart + timedelta(days=random.randrange(60)))
+    return rrs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--window', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    random = Random(args.seed)
+
+    started = perf_counter()
+    rules = [(key, make_rule(random)) for key in range(args.rules)]
+    print('%d rules created in %.1f s' % (
+        args.rules, perf_counter() - started), file=sys.stderr)
+
+    started = perf_counter()
+    index = RuleIndex(rules)
+    elapsed = perf_counter() - started
+    print('indexed in %.1f s (%.1f µs/rule)' % (
+        elapsed, elapsed / args.rules * 1e6))
+
+    window = timedelta(minutes=args.window)
+    candidates = matches = 0
+    candidates_time = query_time = 0
+    for _ in range(args.queries):
+        start = START + timedelta(minutes=random.randrange(60 * 24 * 400))
+        started = perf_counter()
+        candidates += sum(1 for _ in index.candidates(start, start + window))
+        candidates_time += perf_counter() - started
+        started = perf_counter()
+        matches += len(index.query(start, start + window))
+        query_time += perf_counter() - started
+    print('%d minute windows: %.0f candidates (%.2f%%) in %.1f ms, '
+          '%.0f matches in %.1f ms' % (
+              args.window, candidates / args.queries,
+              candidates / args.queries / args.rules * 100,
+              candidates_time / args.queries * 1e3,
+              matches / args.queries, query_time / args.queries * 1e3))
+
+    started = perf_counter()
+    for key in range(0, args.rules, 10):
+        index.remove(key)
+    elapsed = perf_counter() - started
+    print('removed %d rules in %.1f s' % (
+        len(range(0, args.rules, 10)), elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Report the memory used to describe rulesets of many dates.
+
+    python benchmarks/memory.py [SIZES...]
+
+Peak and retained memory are traced with `rrule34.instrumentation`, for
+the rulesets of `rrule34.tests.test_memory.sample_ruleset`, in every locale.
+"""
+import sys
+
+from rrule34.formatting import format_rruleset
+from rrule34.instrumentation import measure_memory
+from rrule34.tests.test_memory import sample_ruleset
+
+LOCALES = ('en_US', 'fr_FR')
+SIZES = (10, 1000, 100000)
+
+
+def profile(locale, dates):
+    """Return the description length and `MemoryStats` of a ruleset."""
+    rrs = sample_ruleset(dates)
+    # Locale data and patterns are loaded once, out of the measure
+    format_rruleset(sample_ruleset(1), locale)
+    description, stats = measure_memory(format_rruleset, rrs, locale)
+    return len(description), stats
+
+
+if __name__ == '__main__':
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    print('%-6s %8s %12s %12s %12s %10s' % (
+        'locale', 'dates', 'length', 'peak', 'retained', 'blocks'))
+    for locale in LOCALES:
+        for dates in sizes:
+            length, stats = profile(locale, dates)
+            print('%-6s %8d %12d %12d %12d %10d' % (
+                locale, dates, length, stats.peak, stats.size,
+                stats.blocks))
@@ -0,0 +1,31 @@
+"""Compare format_rrule_string with the rrulestr + format_rrule route."""
+from timeit import repeat
+
+from dateutil.rrule import rrulestr
+
+from rrule34.formatting import format_rrule, format_rrule_string
+
+RULES = (
+    'FREQ=DAILY',
+    'FREQ=WEEKLY;BYDAY=MO,WE',
+    'FREQ=MONTHLY;BYMONTHDAY=1,15;COUNT=12',
+    'FREQ=YEARLY;BYMONTH=3,6;BYDAY=MO;UNTIL=20301225T112500',
+)
+
+
+def dateutil_route():
+    for rule in RULES:
+        format_rrule(rrulestr(rule))
+
+
+def fast_route():
+    for rule in RULES:
+        format_rrule_string(rule)
+
+
+if __name__ == '__main__':
+    number = 2000
+    for name, func in (('rrulestr', dateutil_route), ('fast', fast_route)):
+        best = min(repeat(func, number=number, repeat=5))
+        print('%-10s %8.2f µs/rule' % (
+            name, best / number / len(RULES) * 1e6))
@@ -0,0 +1,136 @@
+"""Benchmark every formatting path of rrule34 and report results as JSON.
+
+    python benchmarks/suite.py [--quick] [--filter NAME] [--output FILE]
+
+Each case is timed with ``timeit`` (best of ``--repeat`` runs) for every
+locale and date verbosity. Compare two JSON reports to track regressions
+between releases.
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timedelta
+from timeit import Timer
+
+from dateutil.rrule import (
+    DAILY, MONTHLY, WEEKLY, YEARLY, rrule, rruleset)
+
+import rrule34
+from rrule34.formatting import format_rrule, format_rruleset
+
+LOCALES = ('en_US', 'fr_FR')
+DATE_VERBOSITIES = ('full', 'long', 'medium', 'short')
+DTSTART = datetime(2010, 1, 10, 10, 1, 10)
+UNTIL = datetime(2020, 2, 20, 20, 2, 20)
+
+RRULES = {
+    'every': dict(freq=DAILY),
+    'interval': dict(freq=WEEKLY, interval=2),
+    'count': dict(freq=DAILY, count=12),
+    'until': dict(freq=DAILY, until=UNTIL),
+    'bysetpos': dict(freq=MONTHLY, byweekday=(0, 4), bysetpos=(-2, 1)),
+    'bymonth': dict(freq=YEARLY, bymonth=(1, 3, 12)),
+    'bymonthday': dict(freq=MONTHLY, bymonthday=(1, 15, -1)),
+    'byyearday': dict(freq=YEARLY, byyearday=(12, 87, 350)),
+    'byweekno': dict(freq=YEARLY, byweekno=(12, 13, 39)),
+    'byweekday': dict(freq=WEEKLY, byweekday=(0, 2, 4)),
+    'byeaster': dict(freq=YEARLY, byeaster=(-3, -2, 1)),
+    'everything': dict(
+        freq=MONTHLY, until=UNTIL, bysetpos=(-4, -2, 1),
+        bymonth=(2, 5, 11), bymonthday=(12, 15, 18, 20),
+        byyearday=(12, 87, 350, 220), byweekno=(12, 13, 39),
+        byweekday=(1, 2, 4, 5), byeaster=(-3, -2, 1)),
+}
+
+RULESET_SIZES = (0, 10, 1000, 20000)
+QUICK_RULESET_SIZES = (0, 10, 1000)
+
+
+def make_ruleset(size):
+    rrs = rruleset()
+    rrs.rrule(rrule(freq=WEEKLY, dtstart=DTSTART, byweekday=(0, 2)))
+    rrs.exrule(rrule(freq=MONTHLY, dtstart=DTSTART, bymonthday=(1, 15)))
+    for i in range(size // 2):
+        rrs.rdate(DTSTART + timedelta(days=i, hours=i % 24))
+    for i in range(size - size // 2):
+        rrs.exdate(DTSTART + timedelta(days=i, minutes=i % 60))
+    return rrs
+
+
+def cases(ruleset_sizes):
+    for name, kwargs in RRULES.items():
+        rr = rrule(dtstart=DTSTART, **kwargs)
+        yield 'rrule.%s' % name, 1, (
+            lambda locale, verbosity, rr=rr: format_rrule(
+                rr, locale, date_verbosity=verbosity,
+                include_start_date=True))
+    for size in ruleset_sizes:
+        rrs = make_ruleset(size)
+        yield 'rruleset', size, (
+            lambda locale, verbosity, rrs=rrs: format_rruleset(
+                rrs, locale, date_verbosity=verbosity))
+
+
+def measure(func, repeat, min_time):
+    timer = Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 10 > min_time else 10
+    timings = [elapsed] + timer.repeat(repeat - 1, number)
+    return number, min(timings) / number, sum(timings) / len(timings) / number
+
+
+def run(names=None, quick=False, repeat=5, min_time=0.05):
+    results = []
+    for name, size, func in cases(
+            QUICK_RULESET_SIZES if quick else RULESET_SIZES):
+        if names and not any(part in name for part in names):
+            continue
+        for locale in LOCALES:
+            for verbosity in DATE_VERBOSITIES:
+                number, best, mean = measure(
+                    lambda: func(locale, verbosity), repeat, min_time)
+                results.append({
+                    'name': name, 'size': size, 'locale': locale,
+                    'date_verbosity': verbosity, 'number': number,
+                    'best': best, 'mean': mean})
+                print('%-20s %6d %s %-6s %12.1f µs' % (
+                    name, size, locale, verbosity, best * 1e6),
+                    file=sys.stderr)
+    return {
+        'rrule34': rrule34.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'versions': {
+            module: sys.modules[module].__version__
+            for module in ('babel', 'dateutil')},
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help='JSON report file (default stdout)')
+    parser.add_argument(
+        '--filter', action='append', help='only run matching cases')
+    parser.add_argument(
+        '--quick', action='store_true', help='skip the largest rulesets')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    args = parser.parse_args(argv)
+    report = run(args.filter, args.quick, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump(report, fd, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
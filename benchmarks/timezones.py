@@ -0,0 +1,35 @@
+"""Compare naive and time zone aware date rendering in every locale."""
+from datetime import datetime, timedelta
+from timeit import repeat
+
+from babel.dates import format_datetime
+from pytz import timezone
+
+from rrule34.formatting import get_formatter
+
+LOCALES = ('en_US', 'fr_FR')
+DATE_VERBOSITIES = ('full', 'long', 'medium', 'short')
+PARIS = timezone('Europe/Paris')
+# Two weeks every hour around the spring DST transition
+NAIVE = [datetime(2015, 3, 20) + timedelta(hours=h) for h in range(24 * 14)]
+AWARE = [PARIS.normalize(PARIS.localize(dt)) for dt in NAIVE]
+
+
+def bench(func, dts, number=5):
+    best = min(repeat(
+        lambda: [func(dt) for dt in dts], number=number, repeat=5))
+    return best / number / len(dts) * 1e6
+
+
+if __name__ == '__main__':
+    print('%-6s %-6s %10s %10s %10s' % (
+        'locale', 'format', 'naive', 'aware', 'babel'))
+    for locale in LOCALES:
+        for verbosity in DATE_VERBOSITIES:
+            lang = get_formatter(locale, verbosity)
+            print('%-6s %-6s %8.2fµs %8.2fµs %8.2fµs' % (
+                locale, verbosity,
+                bench(lang.format_dt, NAIVE),
+                bench(lang.format_dt, AWARE),
+                bench(lambda dt: format_datetime(
+                    dt, verbosity, locale=locale), AWARE)))
@@ -1 +1,7 @@
 __version__ = '1.0.0'
+
+
+def warmup(locales=None, verbosities=None, **kwargs):
+    """Preload formatters, see `rrule34.preload.warmup`."""
+    from .preload import DATE_VERBOSITIES, warmup
+    return warmup(locales, verbosities or DATE_VERBOSITIES, **kwargs)
@@ -0,0 +1,41 @@
+from collections import namedtuple
+
+BY_RULES = (
+    'bysetpos', 'bymonth', 'bymonthday', 'byyearday', 'byweekno',
+    'byweekday', 'byeaster')
+
+
+class RuleTree(namedtuple('RuleTree', (
+        'freq', 'interval', 'by', 'until', 'count', 'tzinfo', 'dtstart',
+        'shape'))):
+    """Locale-neutral analysis of an rrule.
+
+    ``by`` holds ``(name, values)`` pairs in rendering order, with sorted
+    weekday numbers and by-values. ``dtstart`` and ``tzinfo`` are only set
+    when the start date is part of the description, and the times of day
+    are left out, as they are not described. ``shape`` tells which parts are
+    present, rules sharing it are rendered by the same compiled plan. Trees
+    are hashable, so they are part of the description cache keys.
+    """
+
+    __slots__ = ()
+
+
+def analyze(rr, include_start_date=False):
+    by_rules = rr._original_rule
+    by = []
+    names = []
+    for name in BY_RULES:
+        values = by_rules.get(name)
+        if values:
+            names.append(name)
+            by.append((name, tuple(sorted(
+                getattr(v, 'weekday', v) for v in values))))
+    interval, until, count = rr._interval, rr._until, rr._count
+    dtstart = tzinfo = None
+    if include_start_date:
+        dtstart, tzinfo = rr._dtstart, rr._tzinfo
+    return RuleTree(
+        rr._freq, interval, tuple(by), until, count, tzinfo, dtstart,
+        (interval > 1, bool(include_start_date), bool(until), tuple(names),
+         bool(count)))
@@ -0,0 +1,211 @@
+import os
+import sqlite3
+from collections import OrderedDict, namedtuple
+from hashlib import sha1
+from threading import Lock
+from time import time
+
+from . import __version__
+from .analysis import analyze
+
+CacheInfo = namedtuple(
+    'CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize'))
+
+
+def rrule_key(
+        rr, include_start_date=False, locale='en_US', date_verbosity='full'):
+    """Return the key of the description of ``rr`` in a cache."""
+    return locale, date_verbosity, analyze(rr, include_start_date)
+
+
+def stable_key(tree):
+    """Return a text key for ``tree`` that is the same in every process.
+
+    Returns None when a part has no stable representation, such as a time
+    zone without a name.
+    """
+    key = repr((
+        tree.freq, tree.interval, tree.by, tree.until, tree.count,
+        tree.dtstart, getattr(tree.tzinfo, 'zone', None) or tree.tzinfo))
+    if ' at 0x' in key:
+        return None
+    return key
+
+
+def default_version():
+    # Descriptions change with the library and with the CLDR data
+    from babel import __version__ as babel_version
+
+    return '%s/babel-%s' % (__version__, babel_version)
+
+
+class RenderCache(object):
+    """Bounded LRU cache of descriptions, keyed by `rrule_key`.
+
+    Keys hold the locale and date verbosity, so that formatters of every
+    locale can share one cache.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize,
+            len(self._data))
+
+
+class SQLiteCache(object):
+    """Persistent description cache, shared by the processes of a host.
+
+    It offers the `RenderCache` interface. Entries are keyed by a hash of
+    the rule, locale, date verbosity and ``version``, so that descriptions
+    never outlive an upgrade, while processes of several versions can
+    share the file.
+
+    Entries older than ``max_age`` seconds are ignored, and removed with
+    the oldest entries beyond ``maxsize`` when the file is opened, and
+    every ``PRUNE_INTERVAL`` writes of a process.
+    """
+
+    PRUNE_INTERVAL = 256
+
+    def __init__(
+            self, path, version=None, timeout=30, maxsize=100000,
+            max_age=30 * 24 * 3600):
+        self.path = path
+        self.version = version or default_version()
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.hits = self.misses = self.evictions = 0
+        self._writes = 0
+        self._connection = None
+        self._pid = None
+        self._lock = Lock()
+
+    @property
+    def connection(self):
+        # Connections cannot cross a fork, each process opens its own
+        if self._pid != os.getpid():
+            self._connection = self.connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def connect(self):
+        connection = sqlite3.connect(
+            self.path, self.timeout, isolation_level=None,
+            check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS descriptions '
+                '(key BLOB PRIMARY KEY, description TEXT, written REAL) '
+                'WITHOUT ROWID')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS descriptions_written '
+                'ON descriptions (written)')
+        self._prune(connection)
+        return connection
+
+    def _expiry(self):
+        return time() - self.max_age if self.max_age is not None else None
+
+    def _prune(self, connection):
+        expiry = self._expiry()
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            if expiry is not None:
+                self.evictions += connection.execute(
+                    'DELETE FROM descriptions WHERE written < ?',
+                    (expiry,)).rowcount
+            if self.maxsize is not None:
+                self.evictions += connection.execute(
+                    'DELETE FROM descriptions WHERE key IN ('
+                    'SELECT key FROM descriptions ORDER BY written DESC '
+                    'LIMIT -1 OFFSET ?)', (self.maxsize,)).rowcount
+
+    def prune(self):
+        """Remove the expired entries, and the oldest beyond ``maxsize``."""
+        with self._lock:
+            self._prune(self.connection)
+
+    def _hash(self, key):
+        locale, date_verbosity, tree = key
+        key = stable_key(tree)
+        if key is not None:
+            return sha1(('%s\0%s\0%s\0%s' % (
+                self.version, locale, date_verbosity, key)
+            ).encode('utf-8')).digest()
+
+    def get(self, key):
+        with self._lock:
+            digest = self._hash(key)
+            row = digest and self.connection.execute(
+                'SELECT description FROM descriptions '
+                'WHERE key = ? AND written >= ?',
+                (digest, self._expiry() or 0)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        with self._lock:
+            digest = self._hash(key)
+            if digest is None:
+                return
+            self.connection.execute(
+                'INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?)',
+                (digest, value, time()))
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                self._prune(self.connection)
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute('DELETE FROM descriptions')
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            currsize, = self.connection.execute(
+                'SELECT COUNT(*) FROM descriptions').fetchone()
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, currsize)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = self._pid = None
@@ -0,0 +1,239 @@
+"""Describe recurrence rules read line by line.
+
+    python -m rrule34 [INPUT] [--output FILE] [--format tsv|jsonl] [--jobs N]
+
+Each input line holds a rule, or a tab-separated row with the rule in
+``--column``. Multi-line rules (DTSTART, RDATE, EXDATE...) are written on one
+line with ``\\n`` escapes, as in PostgreSQL text dumps.
+
+Invalid rules, and lines that are not UTF-8, are reported on stderr with
+their line number, and left out of the output. The exit status is then 1.
+"""
+import argparse
+import json
+import sys
+from collections import deque
+from mmap import ACCESS_READ, mmap
+
+from .formatting import DATE_VERBOSITIES, get_formatter
+from .parallel import format_rule, iformat_bulk
+
+BUFFER_SIZE = 1 << 20
+ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '\\': '\\'}
+
+
+def unescape(text):
+    if '\\' not in text:
+        return text
+    parts = text.split('\\')
+    chars = [parts[0]]
+    parts = iter(parts[1:])
+    for part in parts:
+        if part:
+            chars.append(ESCAPES.get(part[0], part[0]) + part[1:])
+        else:  # Escaped backslash
+            chars.append('\\' + next(parts, ''))
+    return ''.join(chars)
+
+
+def escape(text):
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        text = text.replace('\\', '\\\\').replace('\t', '\\t').replace(
+            '\n', '\\n').replace('\r', '\\r')
+    return text
+
+
+def read_lines(path, use_mmap=False):
+    """Yield the numbers and decoded lines of ``path`` (or stdin for ``-``).
+
+    Blank lines are skipped, lines that are not UTF-8 are None.
+    """
+    if path == '-':
+        fd = open(sys.stdin.fileno(), 'rb', BUFFER_SIZE, closefd=False)
+    else:
+        fd = open(path, 'rb', BUFFER_SIZE)
+    with fd:
+        if use_mmap and path != '-':
+            try:
+                lines = mmap(fd.fileno(), 0, access=ACCESS_READ)
+            except ValueError:  # Empty file
+                return
+            with lines:
+                yield from _decode(iter(lines.readline, b''))
+        else:
+            yield from _decode(fd)
+
+
+def _decode(lines):
+    for number, line in enumerate(lines, 1):
+        try:
+            line = line.decode('utf-8').rstrip('\r\n')
+        except UnicodeDecodeError:
+            yield number, None
+            continue
+        if line.strip():
+            yield number, line
+
+
+def read_records(lines, column=None):
+    """Yield ``(number, fields, rule)`` for every numbered line.
+
+    ``rule`` is the `ValueError` to report for lines without a rule: lines
+    that are not UTF-8, or rows without ``column``.
+    """
+    for number, line in lines:
+        if line is None:
+            yield number, None, ValueError('not UTF-8')
+        elif column is None:
+            yield number, None, unescape(line)
+        else:
+            fields = line.split('\t')
+            if column > len(fields):
+                yield number, fields, ValueError('missing rule column')
+            else:
+                yield number, fields, unescape(fields[column - 1])
+
+
+def describe(records, locale, date_verbosity, jobs=1, chunksize=512,
+             **kwargs):
+    """Yield ``(number, fields, rule, description)`` in input order.
+
+    The description of an invalid rule is the exception it raised, or the
+    error read instead of the rule. With several jobs, at most a bounded
+    number of chunks are waiting for their descriptions, so memory use
+    does not grow with the input.
+    """
+    if jobs == 1:
+        lang = get_formatter(locale, date_verbosity)
+        for number, fields, rule in records:
+            if isinstance(rule, Exception):
+                description = rule
+            else:
+                try:
+                    description = format_rule(lang, rule, **kwargs)
+                except Exception as exception:
+                    description = exception
+            yield number, fields, rule, description
+        return
+    pending = deque()
+
+    def rules():
+        for record in records:
+            pending.append(record)
+            if not isinstance(record[2], Exception):
+                yield record[2]
+
+    def unread():
+        while pending and isinstance(pending[0][2], Exception):
+            record = pending.popleft()
+            yield record + (record[2],)
+
+    for description in iformat_bulk(
+            rules(), locale, date_verbosity, chunksize, jobs or None,
+            return_exceptions=True, **kwargs):
+        yield from unread()
+        yield pending.popleft() + (description,)
+    yield from unread()
+
+
+def report_errors(results, errors):
+    """Yield ``(fields, rule, description)`` for the valid ``results``.
+
+    Invalid rules are reported on stderr, and their line numbers appended
+    to ``errors``.
+    """
+    for number, fields, rule, description in results:
+        if isinstance(description, Exception):
+            errors.append(number)
+            sys.stderr.write('rrule34: line %d: %s%s\n' % (
+                number, '' if rule is description else 'invalid rule: ',
+                description))
+        else:
+            yield fields, rule, description
+
+
+def write_tsv(output, results):
+    for fields, rule, description in results:
+        output.write('%s\t%s\n' % (
+            escape(rule) if fields is None else '\t'.join(fields),
+            escape(description)))
+
+
+def write_jsonl(output, results):
+    for fields, rule, description in results:
+        row = {'rule': rule, 'description': description}
+        if fields is not None:
+            row['columns'] = fields
+        output.write(json.dumps(row, ensure_ascii=False))
+        output.write('\n')
+
+
+WRITERS = {'tsv': write_tsv, 'jsonl': write_jsonl}
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog='rrule34', description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'input', nargs='?', default='-', help='input file (default stdin)')
+    parser.add_argument('-o', '--output', help='output file (default stdout)')
+    parser.add_argument(
+        '-f', '--format', choices=sorted(WRITERS), default='tsv')
+    parser.add_argument(
+        '-l', '--locale', default='en_US',
+        help='locale, falling back to its language then to en_US')
+    parser.add_argument(
+        '-d', '--date-verbosity', choices=DATE_VERBOSITIES, default='full')
+    parser.add_argument(
+        '-c', '--column', type=int,
+        help='read rules from this tab-separated column (starting at 1)')
+    parser.add_argument(
+        '--include-start-date', action='store_true', default=None,
+        help='always describe the start date')
+    parser.add_argument(
+        '--exclude-start-date', action='store_false',
+        dest='include_start_date', help='never describe the start date')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='worker processes (0 for one per CPU)')
+    parser.add_argument(
+        '--chunksize', type=int, default=512,
+        help='rules sent to a worker at once')
+    parser.add_argument(
+        '--mmap', action='store_true', help='memory-map the input file')
+    return parser
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.column is not None and args.column < 1:
+        parser.error('--column starts at 1')
+    if args.jobs < 0:
+        parser.error('--jobs cannot be negative')
+    if args.chunksize < 1:
+        parser.error('--chunksize must be positive')
+    kwargs = {}
+    if args.include_start_date is not None:
+        kwargs['include_start_date'] = args.include_start_date
+
+    errors = []
+    results = report_errors(describe(
+        read_records(read_lines(args.input, args.mmap), args.column),
+        args.locale, args.date_verbosity, args.jobs, args.chunksize,
+        **kwargs), errors)
+    if args.output:
+        output = open(
+            args.output, 'w', BUFFER_SIZE, encoding='utf-8', newline='\n')
+    else:
+        output = open(
+            sys.stdout.fileno(), 'w', BUFFER_SIZE, encoding='utf-8',
+            newline='\n', closefd=False)
+    try:
+        with output:
+            WRITERS[args.format](output, results)
+    except BrokenPipeError:  # Output closed early, as by head
+        sys.stderr.close()
+        return
+    if errors:
+        sys.exit(1)
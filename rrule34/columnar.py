@@ -0,0 +1,123 @@
+"""Store bulk descriptions as a table of distinct strings and indices.
+
+Exports of many rules repeat the same few descriptions: a `DescriptionTable`
+keeps each distinct description once, and one ``array('I')`` index per
+rule, so that memory and written files grow with the number of distinct
+descriptions.
+
+The binary format is ``MAGIC``, the number of strings and of rows as
+little-endian unsigned 32-bit integers, each string as its UTF-8 length
+and bytes, then the row indices.
+"""
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from .formatting import get_formatter
+from .parallel import format_rule, iformat_bulk
+
+MAGIC = b'RR34TBL1'
+HEADER = struct.Struct('<II')
+LENGTH = struct.Struct('<I')
+
+
+class DescriptionTable(object):
+    """Distinct descriptions, and the index of each row's description."""
+
+    def __init__(self, descriptions=()):
+        self.strings = []
+        self.ids = {}
+        self.indices = array('I')
+        self.extend(descriptions)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, row):
+        return self.strings[self.indices[row]]
+
+    def __iter__(self):
+        strings = self.strings
+        return (strings[index] for index in self.indices)
+
+    def append(self, description):
+        self.extend((description,))
+
+    def extend(self, descriptions):
+        ids, strings, indices = self.ids, self.strings, self.indices
+        for description in descriptions:
+            index = ids.get(description)
+            if index is None:
+                index = ids[description] = len(strings)
+                strings.append(description)
+            indices.append(index)
+
+    def write_csv(self, strings_output, indices_output):
+        """Write ``id,description`` rows, and one id per row."""
+        writer = csv.writer(strings_output, lineterminator='\n')
+        writer.writerow(('id', 'description'))
+        writer.writerows(enumerate(self.strings))
+        _write_indices(indices_output, self.indices)
+
+    def write_jsonl(self, strings_output, indices_output):
+        """Write one JSON object per string, and one id per row."""
+        for index, description in enumerate(self.strings):
+            strings_output.write(json.dumps(
+                {'id': index, 'description': description},
+                ensure_ascii=False))
+            strings_output.write('\n')
+        _write_indices(indices_output, self.indices)
+
+    def write_binary(self, output):
+        output.write(MAGIC)
+        output.write(HEADER.pack(len(self.strings), len(self.indices)))
+        for description in self.strings:
+            encoded = description.encode('utf-8')
+            output.write(LENGTH.pack(len(encoded)))
+            output.write(encoded)
+        indices = self.indices
+        if sys.byteorder != 'little':
+            indices = array('I', indices)
+            indices.byteswap()
+        indices.tofile(output)
+
+    @classmethod
+    def read_binary(cls, input_):
+        if input_.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a description table')
+        strings, rows = HEADER.unpack(input_.read(HEADER.size))
+        table = cls()
+        for index in range(strings):
+            length, = LENGTH.unpack(input_.read(LENGTH.size))
+            description = input_.read(length).decode('utf-8')
+            table.strings.append(description)
+            table.ids[description] = index
+        table.indices.fromfile(input_, rows)
+        if sys.byteorder != 'little':
+            table.indices.byteswap()
+        return table
+
+
+def _write_indices(output, indices):
+    for start in range(0, len(indices), 4096):
+        output.write(''.join(
+            '%d\n' % index for index in indices[start:start + 4096]))
+
+
+def format_table(
+        rules, locale='en_US', date_verbosity='full', max_workers=1,
+        chunksize=512, **kwargs):
+    """Describe ``rules`` into a `DescriptionTable`, in order.
+
+    Rules are rrules, rrulesets or rule strings. With several
+    ``max_workers``, they are described by `rrule34.parallel.iformat_bulk`.
+    """
+    if max_workers == 1:
+        lang = get_formatter(locale, date_verbosity)
+        descriptions = (format_rule(lang, rule, **kwargs) for rule in rules)
+    else:
+        descriptions = iformat_bulk(
+            rules, locale, date_verbosity, chunksize, max_workers, **kwargs)
+    return DescriptionTable(descriptions)
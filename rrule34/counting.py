@@ -0,0 +1,115 @@
+"""Count the occurrences of rrules without iterating all of them.
+
+Rules repeating one occurrence at a fixed step are counted arithmetically.
+Rules under a month long cycle (secondly to weekly rules filtered by time
+and by weekday) repeat the same occurrences every cycle: one cycle and the
+last partial one are enumerated, the others are multiplied. Other rules are
+enumerated, with `rrule34.expansion` when NumPy is installed.
+"""
+from datetime import timedelta
+from math import gcd
+
+from .frequencies import (
+    DAILY, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY)
+from .parsing import as_rrule
+
+STEPS = {
+    SECONDLY: 1, MINUTELY: 60, HOURLY: 3600, DAILY: 86400, WEEKLY: 604800}
+CYCLIC_RULES = {'bysetpos', 'byweekday', 'byhour', 'byminute', 'bysecond'}
+# Cycles with more steps than this are enumerated as a whole
+MAX_CYCLE_STEPS = 100000
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def count_occurrences(rr, after=None, inc=False):
+    """Return how many times ``rr`` occurs, or None if it never ends.
+
+    With ``after``, only the occurrences after this datetime are counted,
+    and the one at this datetime when ``inc`` is true.
+    """
+    rr = as_rrule(rr)
+    if rr._until is None and rr._count is None:
+        return None
+    total = rr._count
+    if rr._until is not None:
+        through = count_through(rr, rr._until)
+        total = through if total is None else min(total, through)
+    if after is None:
+        return total
+    passed = count_through(rr, after - ONE_MICROSECOND if inc else after)
+    return max(total - passed, 0)
+
+
+def count_through(rr, end):
+    """Count the occurrences of ``rr`` until ``end``, ignoring its bounds."""
+    dtstart = rr._dtstart
+    if end < dtstart:
+        return 0
+    if dtstart.tzinfo is None and not any(rr._original_rule.values()):
+        count = _closed_form(rr._freq, rr._interval, dtstart, end)
+        if count is not None:
+            return count
+    period = cycle(rr)
+    if period is not None:
+        cycles = (end - dtstart) // period
+        steps = period // timedelta(seconds=STEPS[rr._freq] * rr._interval)
+        if cycles >= 2 and steps <= MAX_CYCLE_STEPS:
+            first = rebuild(rr, dtstart, dtstart + period - ONE_MICROSECOND)
+            last = rebuild(rr, dtstart + cycles * period, end)
+            return cycles * _enumerate(first) + _enumerate(last)
+    return _enumerate(rebuild(rr, dtstart, end))
+
+
+def _closed_form(freq, interval, dtstart, end):
+    if freq in STEPS:
+        step = timedelta(seconds=STEPS[freq] * interval)
+        return (end - dtstart) // step + 1
+    if freq == MONTHLY and dtstart.day <= 28:
+        months = (end.year - dtstart.year) * 12 + end.month - dtstart.month
+        periods = months // interval
+        month = dtstart.month - 1 + periods * interval
+        if dtstart.replace(
+                year=dtstart.year + month // 12, month=month % 12 + 1) > end:
+            periods -= 1
+        return periods + 1
+    if freq == YEARLY and (dtstart.month, dtstart.day) != (2, 29):
+        periods = (end.year - dtstart.year) // interval
+        if dtstart.replace(year=dtstart.year + periods * interval) > end:
+            periods -= 1
+        return periods + 1
+
+
+def cycle(rr):
+    """Return the period ``rr`` repeats its occurrences at, if it is short.
+
+    Secondly to weekly rules on naive datetimes, only filtered by time, by
+    weekday and by setpos, repeat every day or every week.
+    """
+    by_rules = {name for name, values in rr._original_rule.items() if values}
+    if (rr._freq not in STEPS or rr._dtstart.tzinfo is not None or
+            not by_rules <= CYCLIC_RULES or
+            getattr(rr, '_bynweekday', None)):
+        return None
+    step = STEPS[rr._freq] * rr._interval
+    filters = 604800 if 'byweekday' in by_rules else 86400
+    return timedelta(seconds=step * filters // gcd(step, filters))
+
+
+def rebuild(rr, dtstart, until=None):
+    """Return a dateutil rrule like ``rr``, with new start and end."""
+    from dateutil.rrule import rrule
+
+    return rrule(
+        rr._freq, dtstart=dtstart, interval=rr._interval, wkst=rr._wkst,
+        until=until, **rr._original_rule)
+
+
+def _enumerate(rr):
+    try:
+        from .expansion import expand, supported
+    except ImportError:  # No NumPy
+        pass
+    else:
+        if supported(rr):
+            return len(expand(rr))
+    return sum(1 for _ in rr)
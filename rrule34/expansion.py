@@ -0,0 +1,182 @@
+"""Expand rrules into NumPy ``datetime64[us]`` arrays of occurrences.
+
+Daily, weekly, monthly and yearly rules on naive datetimes, with by-month,
+by-month-day, by-weekday (without occurrence numbers) and by-time rules,
+are expanded by filtering blocks of days with array arithmetic. Other rules
+are expanded by iterating `dateutil.rrule.rrule`, and aware occurrences are
+then converted to UTC.
+"""
+from datetime import MAXYEAR, timezone
+
+import numpy
+
+from .frequencies import DAILY, MONTHLY, WEEKLY, YEARLY
+from .parsing import as_rrule
+
+UNIT = 'datetime64[us]'
+DAY = 86400 * 10 ** 6  # In microseconds
+# The Monday of the week holding the epoch day, 1970-01-01
+EPOCH_WEEKDAY = 3
+END_DAY = numpy.datetime64('%d-01-01' % (MAXYEAR + 1), 'D').astype(
+    numpy.int64)
+MIN_BLOCK = 512
+MAX_BLOCK = 1 << 20
+
+
+def supported(rr):
+    """Tell whether ``rr`` can be expanded without dateutil."""
+    rr = as_rrule(rr)
+    return (
+        rr._freq in (YEARLY, MONTHLY, WEEKLY, DAILY) and
+        rr._tzinfo is None and rr._timeset and
+        not (rr._bysetpos or rr._byyearday or rr._byweekno or
+             rr._byeaster or rr._bynweekday) and
+        (rr._until is None or rr._until.tzinfo is None))
+
+
+def _microseconds(dt):
+    # Microseconds since the epoch, for naive datetimes
+    return numpy.datetime64(dt, 'us').astype(numpy.int64)
+
+
+def _months(days):
+    # Months since the epoch of days since the epoch
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(
+        numpy.int64)
+
+
+def _days_filter(rr, days):
+    """Return the mask of the ``days`` (since the epoch) ``rr`` expands."""
+    freq, interval = rr._freq, rr._interval
+    start = numpy.datetime64(rr._dtstart.date(), 'D').astype(numpy.int64)
+    months = None
+    if freq == DAILY:
+        periods, start_period = days, start
+    elif freq == WEEKLY:
+        shift = EPOCH_WEEKDAY - rr._wkst
+        periods, start_period = (days + shift) // 7, (start + shift) // 7
+    else:
+        months = _months(days)
+        start_month = (
+            rr._dtstart.year - 1970) * 12 + rr._dtstart.month - 1
+        if freq == MONTHLY:
+            periods, start_period = months, start_month
+        else:
+            periods, start_period = months // 12, start_month // 12
+    mask = (periods - start_period) % interval == 0 if interval > 1 else (
+        numpy.ones(len(days), dtype=bool))
+
+    if rr._bymonth:
+        if months is None:
+            months = _months(days)
+        mask &= numpy.isin(months % 12 + 1, rr._bymonth)
+    if rr._bymonthday or rr._bynmonthday:
+        if months is None:
+            months = _months(days)
+        first_days = months.astype('datetime64[M]').astype(
+            'datetime64[D]').astype(numpy.int64)
+        monthdays = days - first_days + 1
+        monthday_mask = numpy.isin(monthdays, rr._bymonthday)
+        if rr._bynmonthday:
+            last_days = (months + 1).astype('datetime64[M]').astype(
+                'datetime64[D]').astype(numpy.int64)
+            monthday_mask |= numpy.isin(
+                days - last_days, rr._bynmonthday)
+        mask &= monthday_mask
+    if rr._byweekday:
+        mask &= numpy.isin((days + EPOCH_WEEKDAY) % 7, rr._byweekday)
+    return mask
+
+
+def _expand_blocks(rr, first_day, last_day):
+    """Yield sorted occurrence arrays (as microseconds) of growing blocks."""
+    times = numpy.array([
+        ((t.hour * 60 + t.minute) * 60 + t.second) * 10 ** 6 + t.microsecond
+        for t in rr._timeset], dtype=numpy.int64)
+    block = MIN_BLOCK
+    while first_day < last_day:
+        days = numpy.arange(
+            first_day, min(first_day + block, last_day), dtype=numpy.int64)
+        days = days[_days_filter(rr, days)]
+        yield (days[:, None] * DAY + times[None, :]).ravel()
+        first_day += block
+        block = min(block * 2, MAX_BLOCK)
+
+
+def _vectorized(rr, after, before, inc, limit):
+    dtstart = _microseconds(rr._dtstart)
+    low, high = dtstart, None
+    if rr._until is not None:
+        high = _microseconds(rr._until)
+    if before is not None:
+        before = _microseconds(before) - (0 if inc else 1)
+        high = before if high is None else min(high, before)
+    if after is not None:
+        after = _microseconds(after) + (0 if inc else 1)
+    if high is None and limit is None and rr._count is None:
+        raise ValueError('Cannot expand an unbounded rule without a limit')
+    # Occurrences are counted from the start, even before ``after``
+    if after is not None and rr._count is None:
+        low = max(low, after)
+    last_day = END_DAY if high is None else min(high // DAY + 1, END_DAY)
+
+    chunks = []
+    found = 0
+    counted = 0
+    for occurrences in _expand_blocks(rr, low // DAY, last_day):
+        occurrences = occurrences[occurrences >= low]
+        if high is not None:
+            occurrences = occurrences[occurrences <= high]
+        if rr._count is not None:
+            occurrences = occurrences[:rr._count - counted]
+            counted += len(occurrences)
+        if after is not None:
+            occurrences = occurrences[occurrences >= after]
+        if limit is not None:
+            occurrences = occurrences[:limit - found]
+        chunks.append(occurrences)
+        found += len(occurrences)
+        if found == limit or counted == rr._count:
+            break
+    if not chunks:
+        return numpy.array([], dtype=UNIT)
+    return numpy.concatenate(chunks).astype(UNIT)
+
+
+def _iterated(rr, after, before, inc, limit):
+    occurrences = []
+    for dt in rr:
+        if before is not None and (dt > before or not inc and dt == before):
+            break
+        if after is not None and (dt < after or not inc and dt == after):
+            continue
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        occurrences.append(dt)
+        if len(occurrences) == limit:
+            break
+    return numpy.array(occurrences, dtype=UNIT)
+
+
+def expand(rr, after=None, before=None, inc=False, limit=None):
+    """Return the occurrences of ``rr`` as a ``datetime64[us]`` array.
+
+    Only occurrences between ``after`` and ``before`` are returned,
+    including the bounds when ``inc`` is true, as with
+    `dateutil.rrule.rrule.between`. At most ``limit`` occurrences are
+    returned. Rules with neither count nor until need ``before`` or
+    ``limit``. Parsed `rrule34.parsing.RuleRecord` are accepted too.
+    """
+    rr = as_rrule(rr)
+    if supported(rr):
+        return _vectorized(rr, after, before, inc, limit)
+    if (before is None and limit is None and rr._count is None and
+            rr._until is None):
+        raise ValueError('Cannot expand an unbounded rule without a limit')
+    return _iterated(rr, after, before, inc, limit)
+
+
+def expand_many(rrs, after=None, before=None, inc=False, limit=None):
+    """Yield the occurrences of every rule of ``rrs``, see `expand`."""
+    for rr in rrs:
+        yield expand(rr, after, before, inc, limit)
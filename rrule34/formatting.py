@@ -1,9 +1,158 @@
-from datetime import date, time
-
-from babel.dates import (
-    format_date, format_datetime, format_time, get_day_names, get_month_names)
-from dateutil.rrule import (
-    DAILY, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY)
+from datetime import datetime, time, timedelta, timezone
+from itertools import chain, groupby, repeat
+from threading import Lock
+
+from .analysis import analyze
+from .frequencies import (
+    DAILY, FREQNAMES, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY)
+from .parsing import parse_rrule_string
+
+DATE_VERBOSITIES = ('full', 'long', 'medium', 'short')
+TIMEZONE_FIELDS = 'zZvVOxX'
+ZONE_MARK = '\x01'
+DATE_GROUPS = {
+    'month': (lambda dt: (dt.year, dt.month), 'MMMM y'),
+    'year': (lambda dt: dt.year, 'y'),
+}
+ONE_DAY = timedelta(days=1)
+ENTRY_POINTS = 'rrule34.languages'
+
+_datetime_patterns = {}
+
+
+def split_timezone(pattern, naive):
+    """Take the time zone fields out of ``pattern``.
+
+    For naive datetimes the fields are removed, with the space around them.
+    Otherwise each field is replaced by `ZONE_MARK` and returned apart, so
+    that its rendering can be cached.
+    """
+    from babel.dates import tokenize_pattern, untokenize_pattern
+
+    tokens = []
+    zone_fields = []
+    strip_next = False
+    for tok_type, tok_value in tokenize_pattern(pattern):
+        if tok_type == 'field' and tok_value[0] in TIMEZONE_FIELDS:
+            if not naive:
+                zone_fields.append(tok_value[0] * tok_value[1])
+                tokens.append(('chars', ZONE_MARK))
+            elif tokens and tokens[-1][0] == 'chars':
+                chars = tokens.pop()[1].rstrip()
+                if chars:
+                    tokens.append(('chars', chars))
+            else:
+                strip_next = True
+            continue
+        if strip_next and tok_type == 'chars':
+            tok_value = tok_value.lstrip()
+        strip_next = False
+        if tok_value:
+            tokens.append((tok_type, tok_value))
+    return untokenize_pattern(tokens), zone_fields
+
+
+def get_datetime_pattern(locale, date_verbosity, naive):
+    key = (str(locale), date_verbosity, naive)
+    try:
+        return _datetime_patterns[key]
+    except KeyError:
+        pass
+    from babel.dates import (
+        get_date_format, get_datetime_format, get_time_format, parse_pattern)
+
+    if date_verbosity in DATE_VERBOSITIES:
+        glue = get_datetime_format(
+            date_verbosity, locale=locale).replace("'", '')
+        date_pattern = get_date_format(date_verbosity, locale=locale)
+        time_pattern = get_time_format(date_verbosity, locale=locale).pattern
+    else:
+        glue, date_pattern, time_pattern = None, None, date_verbosity
+    time_pattern, zone_fields = split_timezone(time_pattern, naive)
+    compiled = glue, date_pattern, parse_pattern(time_pattern), tuple(
+        parse_pattern(field) for field in zone_fields)
+    _datetime_patterns[key] = compiled
+    return compiled
+
+
+def localize(dt, tzinfo=None):
+    """Return ``dt`` as a datetime, converted to ``tzinfo`` if given."""
+    if not isinstance(dt, datetime):
+        dt = datetime.combine(dt, time())
+    if tzinfo is not None:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        dt = dt.astimezone(tzinfo)
+        if hasattr(tzinfo, 'normalize'):  # pytz
+            dt = tzinfo.normalize(dt)
+    return dt
+
+
+def date_runs(dates):
+    """Yield ``(first, last, count)`` runs of dates one day apart."""
+    first = last = None
+    count = 0
+    for dt in sorted(dates):
+        if last is not None:
+            if dt == last:
+                continue
+            if dt == last + ONE_DAY:
+                last = dt
+                count += 1
+                continue
+            yield first, last, count
+        first = last = dt
+        count = 1
+    if last is not None:
+        yield first, last, count
+
+
+def split_runs(runs, key):
+    """Split ``(first, last, count)`` runs of days where ``key`` changes."""
+    for first, last, count in runs:
+        group = key(first)
+        while key(last) != group:
+            end, days = first, 1
+            while key(end + ONE_DAY) == group:
+                end += ONE_DAY
+                days += 1
+            yield first, end, days
+            first, count = end + ONE_DAY, count - days
+            group = key(first)
+        yield first, last, count
+
+
+def summarize_dates(dates, group_dates=None, max_dates=None):
+    """Yield a bounded summary of a date list, without formatting it.
+
+    Items are ``('date', dt)``, ``('range', first, last)``,
+    ``('group', count, dt, group_dates)`` and ``('more', count)``.
+    """
+    runs = date_runs(dates)
+    if group_dates:
+        key = DATE_GROUPS[group_dates][0]
+        groups = (group for _, group in groupby(
+            split_runs(runs, key), lambda run: key(run[0])))
+    else:
+        groups = ((run,) for run in runs)
+    emitted = 0
+    for group in groups:
+        if max_dates is not None and emitted >= max_dates:
+            yield 'more', sum(
+                run[2] for rest in chain((group,), groups) for run in rest)
+            return
+        group = iter(group)
+        first, last, count = next(group)
+        for run in group:
+            last = run[1]
+            count += run[2]
+        if count == 1:
+            yield 'date', first
+        elif first + (count - 1) * ONE_DAY == last:
+            yield 'range', first, last
+        else:
+            yield 'group', count, first, group_dates
+        emitted += 1
 
 
 class Word(object):
@@ -20,95 +169,419 @@ class Word(object):
 
 
 class LangCollection(type):
+    """Registry of the languages, loaded on first use.
+
+    Languages are `Lang` subclasses, or phrase catalogs extending one of
+    them. Locales without a language fall back to a more general locale.
+    """
     languages = {}
+    loaders = {}
+    resolved = {}
+    entry_points_loaded = False
+    formatters = {}
+    formatters_lock = Lock()
 
     def __new__(mcs, *args, **kwargs):
         cls = super().__new__(mcs, *args, **kwargs)
+        cls.plans = {}
         if cls.__name__ != 'Lang':
             mcs.languages[cls.__name__] = cls
         return cls
 
+    def clear_plans(cls):
+        for lang in cls.languages.values():
+            lang.plans.clear()
+
     def __getitem__(cls, name):
-        return cls.languages.get(name, 'en_US')()
+        return cls.formatter(name)
+
+    def register(cls, name, loader):
+        """Make the ``name`` language available, loaded on first use.
+
+        ``loader`` is a `Lang` subclass, a phrase catalog (see
+        `from_catalog`), or the ``'module:attribute'`` path of either.
+        Packages can also declare it as a ``rrule34.languages`` entry point.
+        """
+        with cls.formatters_lock:
+            cls.loaders[name] = loader
+            cls.resolved.clear()
+            # Formatters shared by fallback may now have their own language
+            for key in [
+                    key for key, lang in cls.formatters.items()
+                    if lang.__class__.__name__ != key[0]]:
+                del cls.formatters[key]
+
+    def load_entry_points(cls):
+        if cls.entry_points_loaded:
+            return
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:  # Python < 3.8
+            points = ()
+        else:
+            points = entry_points()
+            points = (
+                points.select(group=ENTRY_POINTS)
+                if hasattr(points, 'select') else
+                points.get(ENTRY_POINTS, ()))
+        for point in points:
+            cls.loaders.setdefault(point.name, point.value)
+        LangCollection.entry_points_loaded = True
+
+    def load(cls, name):
+        """Return the ``name`` language class, or None if unknown."""
+        lang = cls.languages.get(name)
+        if lang is not None or name not in cls.loaders:
+            return lang
+        loader = cls.loaders[name]
+        if isinstance(loader, str):
+            from importlib import import_module
+
+            module, _, attribute = loader.partition(':')
+            loader = getattr(import_module(module), attribute)
+        if not isinstance(loader, type):
+            return cls.from_catalog(name, loader)
+        if loader.__name__ == name:
+            return cls.languages.setdefault(name, loader)
+        # Formatters are named after their locale
+        return type(loader)(name, (loader,), {
+            '__slots__': (), '__module__': loader.__module__})
+
+    def from_catalog(cls, name, catalog):
+        """Create the ``name`` language from a phrase ``catalog``.
+
+        The catalog is a mapping of the phrases of its ``base`` language
+        (``en_US`` by default) to replace, see ``PHRASES``. Frequency words
+        can be given by frequency name, as ``(word, genre, plural)`` tuples.
+        """
+        catalog = dict(catalog)
+        base = cls.resolve(catalog.pop('base', 'en_US'))
+        if 'frequencies' in catalog:
+            catalog['frequencies'] = {
+                FREQNAMES.index(freq) if isinstance(freq, str) else freq: (
+                    word if isinstance(word, Word) else
+                    Word(word) if isinstance(word, str) else Word(*word))
+                for freq, word in catalog['frequencies'].items()}
+        phrases = dict(base.PHRASES)
+        for key, value in catalog.items():
+            # Tables are completed, not replaced
+            if isinstance(value, dict) and isinstance(phrases.get(key), dict):
+                value = dict(phrases[key])
+                value.update(catalog[key])
+            phrases[key] = value
+        return type(base)(name, (base,), {
+            '__slots__': (), '__module__': base.__module__,
+            'PHRASES': phrases})
+
+    def fallbacks(cls, name):
+        """Yield the locales tried for ``name``, most specific first.
+
+        ``de_CH`` tries ``de_CH``, ``de``, the other ``de`` locales, then
+        ``en_US``.
+        """
+        parts = name.replace('-', '_').split('_')
+        for end in range(len(parts), 0, -1):
+            yield '_'.join(parts[:end])
+        yield from sorted(
+            locale for locale in set(cls.languages) | set(cls.loaders)
+            if locale.split('_')[0] == parts[0])
+        yield 'en_US'
+
+    def resolve(cls, name):
+        """Return the language class used for locale ``name``."""
+        try:
+            return cls.resolved[name]
+        except KeyError:
+            pass
+        lang = cls.languages.get(name)
+        if lang is None:
+            cls.load_entry_points()
+            for locale in cls.fallbacks(name):
+                lang = cls.load(locale)
+                if lang is not None:
+                    break
+        cls.resolved[name] = lang
+        return lang
+
+    def available(cls):
+        """Return the names of the loaded and registered languages."""
+        cls.load_entry_points()
+        return sorted(set(cls.languages) | set(cls.loaders))
+
+    def formatter(cls, name, date_verbosity='full'):
+        key = (name, date_verbosity)
+        formatters = cls.formatters
+        try:
+            return formatters[key]
+        except KeyError:
+            pass
+        with cls.formatters_lock:
+            if key not in formatters:
+                lang = cls.resolve(name)
+                lang_key = (lang.__name__, date_verbosity)
+                if lang_key not in formatters:
+                    formatters[lang_key] = lang(date_verbosity)
+                formatters[key] = formatters[lang_key]
+            return formatters[key]
 
 
 class Lang(object, metaclass=LangCollection):
-    def format_rrule(
-            self, rr, include_start_date=False, date_verbosity='full'):
-        freq = rr._freq
-        until = rr._until
-        count = rr._count
-        interval = rr._interval
-        by_rules = rr._original_rule
-        by_timeset = rr._timeset
-        wkst = rr._wkst
-        # From event
-        dtstart = rr._dtstart
-        tzinfo = rr._tzinfo
-        if not hasattr(self, 'date_verbosity'):
-            self.date_verbosity = date_verbosity
-
-        parts = []
-        parts.append(self.every(freq, interval))
-        if include_start_date:
-            parts.append(self.since(dtstart, tzinfo))
-        if until:
-            parts.append(self.until(until))
-
-        for by in (
-                'bysetpos', 'bymonth', 'bymonthday', 'byyearday', 'byweekno',
-                'byweekday', 'byeaster'):
-            values = by_rules.get(by)
-            if values:
-                parts.append(self.by(by, sorted([
-                    getattr(v, 'weekday', v) for v in values])))
-
-        if by_timeset:
-            self.by_timeset(by_timeset)
+    __slots__ = (
+        'locale', 'date_verbosity', 'day_names', 'month_names',
+        'datetime_patterns', 'zone_names')
+
+    def __init__(self, date_verbosity='full'):
+        from babel import Locale
+        from babel.dates import get_day_names, get_month_names
+
+        locale = Locale.parse(self.__class__.__name__)
+        set_ = super().__setattr__
+        set_('locale', locale)
+        set_('date_verbosity', date_verbosity)
+        set_('day_names', get_day_names(locale=locale))
+        set_('month_names', get_month_names(locale=locale))
+        set_('datetime_patterns', {
+            naive: get_datetime_pattern(locale, date_verbosity, naive)
+            for naive in (False, True)})
+        set_('zone_names', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s formatters are immutable' % (
+            self.__class__.__name__))
+
+    def with_verbosity(self, date_verbosity):
+        return Lang.formatter(self.__class__.__name__, date_verbosity)
 
-        if count:
-            parts.append(self.count(count))
+    def format_rrule(
+            self, rr, include_start_date=False, date_verbosity=None,
+            cache=None, occurrences=False, after=None):
+        """Describe ``rr``.
+
+        With ``occurrences``, the number of occurrences of rules ending at
+        a date is added, or the number of occurrences remaining after
+        ``after`` when given.
+        """
+        if date_verbosity not in (None, self.date_verbosity):
+            return self.with_verbosity(date_verbosity).format_rrule(
+                rr, include_start_date, cache=cache, occurrences=occurrences,
+                after=after)
+        tree = analyze(rr, include_start_date)
+        if cache is None:
+            description = self.render(tree)
+        else:
+            key = (self.__class__.__name__, self.date_verbosity, tree)
+            description = cache.get(key)
+            if description is None:
+                description = self.render(tree)
+                cache.set(key, description)
+        if occurrences and (after is not None or rr._until is not None):
+            from .counting import count_occurrences
+
+            number = count_occurrences(rr, after)
+            if number is not None:
+                description = '%s %s' % (
+                    description, self.occurrences(number, after is not None))
+        return description
+
+    def render(self, tree):
+        try:
+            plan = self.plans[tree.shape]
+        except KeyError:
+            plan = self.plans[tree.shape] = self.compile(tree.shape)
+        return plan(self, tree)
+
+    def compile(self, shape):
+        """Build a render function for every rule sharing ``shape``.
+
+        The function calls the needed phrase methods directly, so rendering
+        skips the by-rule dispatch and the checks for missing parts.
+        """
+        interval, since, until, by_rules, count = shape
+        cls = self.__class__
+        every = cls.every
+        since = cls.since if since else None
+        until = cls.until if until else None
+        by_methods = [getattr(cls, 'by_' + by[2:]) for by in by_rules]
+        count = cls.count if count else None
+
+        def plan(self, tree):
+            parts = [every(self, tree.freq, tree.interval)]
+            if since is not None:
+                parts.append(since(self, tree.dtstart, tree.tzinfo))
+            if until is not None:
+                parts.append(until(self, tree.until))
+            for by, (_, values) in zip(by_methods, tree.by):
+                parts.append(by(self, values))
+            if count is not None:
+                parts.append(count(self, tree.count))
+            return ' '.join(parts)
+
+        return plan
 
-        return ' '.join(parts)
+    def by(self, by, values):
+        return getattr(self, 'by_' + by[2:])(values)
 
     def format_rruleset(
-            self, rrs, include_start_date=True, date_verbosity='full'):
-        self.date_verbosity = date_verbosity
+            self, rrs, include_start_date=True, date_verbosity=None,
+            cache=None, group_dates=None, max_dates=None):
+        if date_verbosity not in (None, self.date_verbosity):
+            return self.with_verbosity(date_verbosity).format_rruleset(
+                rrs, include_start_date, cache=cache,
+                group_dates=group_dates, max_dates=max_dates)
 
         rrules = [
             self.format_rrule(rr,
-                include_start_date=include_start_date
+                include_start_date=include_start_date, cache=cache
             ) for rr in rrs._rrule]
-        rdates = [self.format_dt(rdate) for rdate in rrs._rdate]
         exrules = [
             self.format_rrule(xr,
-                include_start_date=include_start_date,
+                include_start_date=include_start_date, cache=cache
             ) for xr in rrs._exrule]
-        exdates = [self.format_dt(exdate)for exdate in rrs._exdate]
+        if group_dates or max_dates is not None:
+            rdates = [
+                self.summary(item) for item in summarize_dates(
+                    rrs._rdate, group_dates, max_dates)]
+            exdates = [
+                self.summary(item, excluded=True) for item in summarize_dates(
+                    rrs._exdate, group_dates, max_dates)]
+            return self.join_set(
+                rrules, rdates, exrules, exdates, summarized=True)
+
+        # Dates are phrased as they are formatted, so that big rulesets do
+        # not hold a second list of strings
+        rdates = self.format_dts(rrs._rdate, phrase=self.date_phrase())
+        exdates = self.format_dts(rrs._exdate, phrase=self.date_phrase(True))
+
+        return self.join_set(
+            rrules, rdates, exrules, exdates, summarized=True)
 
-        return self.join_set(rrules, rdates, exrules, exdates)
+    def format_dt(self, dt, tzinfo=None):
+        dt = localize(dt, tzinfo)
+        glue, date_pattern, time_pattern, zone_patterns = (
+            self.datetime_patterns[dt.tzinfo is None])
+        if glue is None:
+            formatted = time_pattern.apply(dt, self.locale)
+        else:
+            formatted = glue.replace(
+                '{0}', time_pattern.apply(dt.timetz(), self.locale)).replace(
+                '{1}', date_pattern.apply(dt.date(), self.locale))
+        if zone_patterns:
+            for zone_name in self.format_zone(dt, zone_patterns):
+                formatted = formatted.replace(ZONE_MARK, zone_name, 1)
+        return formatted
+
+    def format_dts(self, dts, tzinfo=None, phrase=None):
+        """Format many datetimes, as `format_dt` would one by one.
+
+        ``dts`` is an iterable of dates and datetimes or a NumPy
+        ``datetime64`` array. Each calendar day and each time of day is
+        only formatted once, and the strings are put together from these
+        parts. Each string is put in the ``phrase`` pattern if given.
+        """
+        if hasattr(dts, 'dtype'):  # numpy.ndarray
+            dts = dts.astype('datetime64[us]').tolist()
+        locale = self.locale
+        patterns = self.datetime_patterns
+        parts = {}
+        formatted_dts = []
+        for dt in dts:
+            dt = localize(dt, tzinfo)
+            naive = dt.tzinfo is None
+            glue, date_pattern, time_pattern, zone_patterns = patterns[naive]
+            if glue is None:
+                key = naive, dt.replace(tzinfo=None)
+                formatted = parts.get(key)
+                if formatted is None:
+                    formatted = parts[key] = time_pattern.apply(dt, locale)
+            else:
+                # Zone fields are marks, so times do not depend on the zone
+                date_key = naive, dt.date()
+                date_part = parts.get(date_key)
+                if date_part is None:
+                    date_part = parts[date_key] = date_pattern.apply(
+                        date_key[1], locale)
+                time_key = naive, dt.time()
+                time_part = parts.get(time_key)
+                if time_part is None:
+                    time_part = parts[time_key] = time_pattern.apply(
+                        dt.timetz(), locale)
+                formatted = glue.replace('{0}', time_part).replace(
+                    '{1}', date_part)
+            if zone_patterns:
+                for zone_name in self.format_zone(dt, zone_patterns):
+                    formatted = formatted.replace(ZONE_MARK, zone_name, 1)
+            formatted_dts.append(
+                formatted if phrase is None else phrase % formatted)
+        return formatted_dts
+
+    def format_zone(self, dt, zone_patterns):
+        # Names only depend on the zone and on its offset and DST state
+        tzinfo = dt.tzinfo
+        key = (
+            getattr(tzinfo, 'zone', None) or repr(tzinfo), dt.utcoffset(),
+            dt.dst(), dt.tzname())
+        try:
+            return self.zone_names[key]
+        except KeyError:
+            zone_names = self.zone_names[key] = tuple(
+                pattern.apply(dt, self.locale) for pattern in zone_patterns)
+            return zone_names
+
+    def format_number(self, number):
+        from babel.numbers import format_decimal
+
+        return format_decimal(number, locale=self.locale)
+
+    def format_period(self, dt, group):
+        from babel.dates import parse_pattern
+
+        return parse_pattern(DATE_GROUPS[group][1]).apply(dt, self.locale)
 
 
 class en_US(Lang):
-    FREQUENCIES = {
-        SECONDLY: Word('second'),
-        MINUTELY: Word('minute'),
-        HOURLY: Word('hour'),
-        DAILY: Word('day'),
-        WEEKLY: Word('week'),
-        MONTHLY: Word('month'),
-        YEARLY: Word('year'),
+    """English phrases, and the grammar of the languages based on them."""
+    PHRASES = {
+        'frequencies': {
+            SECONDLY: Word('second'),
+            MINUTELY: Word('minute'),
+            HOURLY: Word('hour'),
+            DAILY: Word('day'),
+            WEEKLY: Word('week'),
+            MONTHLY: Word('month'),
+            YEARLY: Word('year'),
+        },
+        'comma': ', ',
+        'and': ' and ',
+        # Ordinals by last digit, except for the teens
+        'ordinal': '%dth',
+        'ordinals': {1: '%dst', 2: '%dnd', 3: '%drd'},
+        'every': ('every %s', 'every %s %s'),
+        'count': ('only once', 'only twice', 'only %d times'),
+        'occurrences': ('(%d occurrence)', '(%d occurrences)'),
+        'remaining': (
+            '(%d occurrence remaining)', '(%d occurrences remaining)'),
+        'since': 'since %s',
+        'until': 'until %s',
+        'first': ('the first', 'the %s first'),
+        'last': ('the last', 'the %s last'),
+        'setpos': ('%s occurence', '%s occurences'),
+        'bymonth': 'on %s',
+        'bymonthday': 'the %s of month',
+        'byyearday': 'the %s of year',
+        'byweekno': ('the week n°%s', 'the weeks n°%s'),
+        'byweekday': 'on %s',
+        'before_easter': ('1 day before Easter', '%s days before Easter'),
+        'after_easter': ('1 day after Easter', '%s days after Easter'),
+        'bytimeset': 'at %s',
+        'date': 'on %s',
+        'range': 'every day from %s to %s',
+        'group': 'on %s dates in %s',
+        'more': ('on %s more date', 'on %s more dates'),
+        'except': 'except %s',
     }
 
-    def format_dt(self, dt, tzinfo=None):
-        dtstr = format_datetime(
-            dt, format=self.date_verbosity, locale='en_US', tzinfo=tzinfo)
-        if (tzinfo or dt.tzinfo) is None:
-            if self.date_verbosity == 'full':
-                dtstr = dtstr.replace(' GMT+00:00', '')
-            elif self.date_verbosity == 'long':
-                dtstr = dtstr.replace(' +0000', '')
-        return dtstr
+    def plural(self, number):
+        return number != 1
 
     def join_list(self, it):
         it = list(map(str, it))
@@ -116,287 +589,329 @@ class en_US(Lang):
             return ''
         if len(it) == 1:
             return it[0]
-        return ' and '.join(
-            [', '.join(it[:-1]), it[-1]])
+        return self.PHRASES['and'].join(
+            [self.PHRASES['comma'].join(it[:-1]), it[-1]])
+
+    def join_strings(self, strings):
+        """Join a long list of strings, as `join_list`, with less memory."""
+        if len(strings) < 2:
+            return strings[0] if strings else ''
+        separators = chain(
+            repeat(self.PHRASES['comma'], len(strings) - 2),
+            (self.PHRASES['and'], ''))
+        return ''.join(chain.from_iterable(zip(strings, separators)))
 
     def nth(self, number):
         if 10 < number < 14:
-            return '%dth' % number
-        if number % 10 == 1:
-            return '%dst' % number
-        if number % 10 == 2:
-            return '%dnd' % number
-        if number % 10 == 3:
-            return '%drd' % number
-        return '%dth' % number
+            return self.PHRASES['ordinal'] % number
+        return self.PHRASES['ordinals'].get(
+            number % 10, self.PHRASES['ordinal']) % number
 
     def every(self, freq, interval):
-        word = self.FREQUENCIES.get(freq)
+        word = self.PHRASES['frequencies'].get(freq)
         if interval > 1:
-            return 'every %s %s' % (interval, word.plural)
-        return 'every %s' % word
+            return self.PHRASES['every'][1] % (interval, word.plural)
+        return self.PHRASES['every'][0] % word
 
     def count(self, count):
-        if count == 1:
-            return 'only once'
-        if count == 2:
-            return 'only twice'
-        return 'only %d times' % count
+        phrases = self.PHRASES['count']
+        if 0 < count < len(phrases):
+            return phrases[count - 1]
+        return phrases[-1] % count
+
+    def occurrences(self, number, remaining=False):
+        return self.PHRASES['remaining' if remaining else 'occurrences'][
+            self.plural(number)] % number
 
     def since(self, dtstart, tzinfo):
-        return 'since %s' % self.format_dt(dtstart, tzinfo)
+        return self.PHRASES['since'] % self.format_dt(dtstart, tzinfo)
 
     def until(self, until):
-        return 'until %s' % self.format_dt(until)
+        return self.PHRASES['until'] % self.format_dt(until)
 
-    def by(self, by, values):
-        if by == 'bysetpos':
-            before = [-v for v in reversed(values) if v < 0]
-            after = [v for v in values if v > 0]
-            parts = []
-            t = 0
-            if after:
-                if len(after) == 1 and after[0] == 1:
-                    parts.append('the first')
-                    t += 1
-                else:
-                    parts.append(
-                        'the %s first' %
-                        self.join_list([self.nth(val) for val in after]))
-                    t += 2
-            if before:
-                if len(before) == 1 and before[0] == 1:
-                    parts.append('the last')
-                    t += 1
-                else:
-                    parts.append(
-                        'the %s last' %
-                        self.join_list([self.nth(val) for val in before]))
-                    t += 2
-
-            return ' and '.join(parts) + ' occurence%s' % (
-                's' if t != 1 else '')
-
-        if by == 'bymonth':
-            return 'on %s' % self.join_list([
-                get_month_names(locale=self.__class__.__name__)[month]
-                for month in values
-            ])
-
-        if by == 'bymonthday':
-            return 'the %s of month' % self.join_list(values)
-
-        if by == 'byyearday':
-            return 'the %s of year' % self.join_list(values)
-
-        if by == 'byweekno':
-            return 'the week%s n°%s' % (
-                's' if len(values) > 1 else '',
-                self.join_list(values))
-
-        if by == 'byweekday':
-            dow = get_day_names(locale=self.__class__.__name__)
-
-            return 'on %s' % self.join_list([
-                 dow[val] for val in values
-            ])
-
-        if by == 'byeaster':
-            before = [-v for v in reversed(values) if v < 0]
-            after = [v for v in values if v > 0]
-            parts = []
-            if before:
-                if len(before) == 1 and before[0] == 1:
-                    parts.append('1 day before Easter')
-                else:
-                    parts.append(
-                        '%s days before Easter' % self.join_list(before))
-            if after:
-                if len(after) == 1 and before[0] == 1:
-                    parts.append('1 day after Easter')
-                else:
-                    parts.append(
-                        '%s days after Easter' % self.join_list(after))
+    def by_setpos(self, values):
+        before = [-v for v in reversed(values) if v < 0]
+        after = [v for v in values if v > 0]
+        parts = []
+        t = 0
+        if after:
+            if len(after) == 1 and after[0] == 1:
+                parts.append(self.PHRASES['first'][0])
+                t += 1
+            else:
+                parts.append(self.PHRASES['first'][1] % self.join_list(
+                    [self.nth(val) for val in after]))
+                t += 2
+        if before:
+            if len(before) == 1 and before[0] == 1:
+                parts.append(self.PHRASES['last'][0])
+                t += 1
+            else:
+                parts.append(self.PHRASES['last'][1] % self.join_list(
+                    [self.nth(val) for val in before]))
+                t += 2
+
+        return self.PHRASES['setpos'][t != 1] % (
+            self.PHRASES['and'].join(parts))
+
+    def by_month(self, values):
+        return self.PHRASES['bymonth'] % self.join_list([
+            self.month_names[month]
+            for month in values
+        ])
+
+    def by_monthday(self, values):
+        return self.PHRASES['bymonthday'] % self.join_list(values)
+
+    def by_yearday(self, values):
+        return self.PHRASES['byyearday'] % self.join_list(values)
+
+    def by_weekno(self, values):
+        return self.PHRASES['byweekno'][len(values) > 1] % (
+            self.join_list(values))
 
-            return ' and '.join(parts)
+    def by_weekday(self, values):
+        dow = self.day_names
+
+        return self.PHRASES['byweekday'] % self.join_list([
+             dow[val] for val in values
+        ])
+
+    def by_easter(self, values):
+        before = [-v for v in reversed(values) if v < 0]
+        after = [v for v in values if v > 0]
+        parts = []
+        if before:
+            if len(before) == 1 and before[0] == 1:
+                parts.append(self.PHRASES['before_easter'][0])
+            else:
+                parts.append(
+                    self.PHRASES['before_easter'][1] % self.join_list(before))
+        if after:
+            if len(after) == 1 and before[0] == 1:
+                parts.append(self.PHRASES['after_easter'][0])
+            else:
+                parts.append(
+                    self.PHRASES['after_easter'][1] % self.join_list(after))
+
+        return self.PHRASES['and'].join(parts)
 
     def by_timeset(self, by_timeset):
-        return 'at %s' % self.join_list([
-             format_time(val, locale=self.__class__.__name__)
+        from babel.dates import format_time
+
+        return self.PHRASES['bytimeset'] % self.join_list([
+             format_time(val, locale=self.locale)
              for val in by_timeset
         ])
 
-    def join_set(self, rrules, rdates, exrules, exdates):
-        parts = []
-        parts.extend(rrules)
-        parts.extend(['on %s' % rd for rd in rdates])
-        parts.extend(['except %s' % xr for xr in exrules])
-        parts.extend(['except on %s' % xd for xd in exdates])
-        return self.join_list(parts)
-
-
-class fr_FR(Lang):
-    MASCULIN = object()
-    FEMININ = object()
-
-    FREQUENCIES = {
-        SECONDLY: Word('seconde', FEMININ),
-        MINUTELY: Word('minute', FEMININ),
-        HOURLY: Word('heure', FEMININ),
-        DAILY: Word('jour', MASCULIN),
-        WEEKLY: Word('semaine', FEMININ),
-        MONTHLY: Word('mois', MASCULIN, 'mois'),
-        YEARLY: Word('an', MASCULIN),
+    def date_phrase(self, excluded=False):
+        """Return the pattern of the phrase of a single date."""
+        if excluded:
+            return self.PHRASES['except'] % self.PHRASES['date']
+        return self.PHRASES['date']
+
+    def summary(self, item, excluded=False):
+        kind = item[0]
+        if kind == 'date':
+            phrase = self.PHRASES['date'] % self.format_dt(item[1])
+        elif kind == 'range':
+            phrase = self.PHRASES['range'] % (
+                self.format_dt(item[1]), self.format_dt(item[2]))
+        elif kind == 'group':
+            phrase = self.PHRASES['group'] % (
+                self.format_number(item[1]),
+                self.format_period(item[2], item[3]))
+        else:
+            phrase = self.PHRASES['more'][self.plural(item[1])] % (
+                self.format_number(item[1]))
+        return self.PHRASES['except'] % phrase if excluded else phrase
+
+    def join_set(self, rrules, rdates, exrules, exdates, summarized=False):
+        """Join the phrases of a ruleset.
+
+        Dates are formatted dates, or already phrased when ``summarized``.
+        """
+        except_ = self.PHRASES['except']
+        parts = list(rrules)
+        if summarized:
+            parts.extend(rdates)
+        else:
+            phrase = self.date_phrase()
+            parts.extend(phrase % rd for rd in rdates)
+        parts.extend(except_ % xr for xr in exrules)
+        if summarized:
+            parts.extend(exdates)
+        else:
+            phrase = self.date_phrase(True)
+            parts.extend(phrase % xd for xd in exdates)
+        return self.join_strings(parts)
+
+
+class fr_FR(en_US):
+    """French phrases, with gendered frequencies and ordinals."""
+    MASCULIN = 'masculine'
+    FEMININ = 'feminine'
+
+    PHRASES = {
+        'frequencies': {
+            SECONDLY: Word('seconde', FEMININ),
+            MINUTELY: Word('minute', FEMININ),
+            HOURLY: Word('heure', FEMININ),
+            DAILY: Word('jour', MASCULIN),
+            WEEKLY: Word('semaine', FEMININ),
+            MONTHLY: Word('mois', MASCULIN, 'mois'),
+            YEARLY: Word('an', MASCULIN),
+        },
+        'comma': ', ',
+        'and': ' et ',
+        'ordinal': '%dème',
+        'ordinals': {MASCULIN: '1er', FEMININ: '1ère'},
+        'every': {MASCULIN: 'tous les %s%s', FEMININ: 'toutes les %s%s'},
+        'count': ('seulement 1 fois', 'seulement %d fois'),
+        'occurrences': ('(%d occurrence)', '(%d occurrences)'),
+        'remaining': (
+            '(%d occurrence restante)', '(%d occurrences restantes)'),
+        'since': 'depuis le %s',
+        'until': 'jusqu’au %s',
+        'first': ('la %s', 'les %s premières'),
+        'last': ('la dernière', 'l’%sdernière', 'les %s dernières'),
+        'before_last': 'avant-',
+        'setpos': ('%s occurence', '%s occurences'),
+        'bymonth': 'en %s',
+        'bymonthday': ('le %s jour du mois', 'les %s jours du mois'),
+        'byyearday': (
+            'le %s jour de l’année', 'les %s jours de l’année'),
+        'byweekno': ('la semaine n°%s', 'les semaines n°%s'),
+        'byweekday': 'le %s',
+        'before_easter': ('la veille de Pâques', '%s jours avant Pâques'),
+        'after_easter': ('le lendemain de Pâques', '%s jours après Pâques'),
+        'bytimeset': 'à %s',
+        'date': 'le %s',
+        'range': 'tous les jours du %s au %s',
+        'group': '%s dates en %s',
+        'more': ('%s autre date', '%s autres dates'),
+        'except': 'sauf %s',
     }
 
-    def format_dt(self, dt, tzinfo=None):
-        dtstr = format_datetime(
-            dt, format=self.date_verbosity, locale='fr_FR', tzinfo=tzinfo)
-        if (tzinfo or dt.tzinfo) is None:
-            if self.date_verbosity == 'full':
-                dtstr = dtstr.replace(' UTC+00:00', '')
-            elif self.date_verbosity == 'long':
-                dtstr = dtstr.replace(' +0000', '')
-        return dtstr
-
-    def join_list(self, it):
-        it = list(map(str, it))
-        if not len(it):
-            return ''
-        if len(it) == 1:
-            return it[0]
-        return ' et '.join(
-            [', '.join(it[:-1]), it[-1]])
+    def plural(self, number):
+        return number > 1
 
     def nth(self, number, genre=MASCULIN):
         if number == 1:
-            return '1er' if genre is self.MASCULIN else '1ère'
-        return '%dème' % number
+            return self.PHRASES['ordinals'][genre]
+        return self.PHRASES['ordinal'] % number
 
     def every(self, freq, interval):
-        word = self.FREQUENCIES.get(freq)
+        word = self.PHRASES['frequencies'].get(freq)
         itvl = '%d ' % interval if interval > 1 else ''
-        if word.genre is self.MASCULIN:
-            return 'tous les %s%s' % (itvl, word.plural)
-        if word.genre is self.FEMININ:
-            return 'toutes les %s%s' % (itvl, word.plural)
+        return self.PHRASES['every'][word.genre] % (itvl, word.plural)
 
-    def count(self, count):
-        if count == 1:
-            return 'seulement 1 fois'
-        return 'seulement %d fois' % count
+    def by_setpos(self, values):
+        before = [-v for v in reversed(values) if v < 0]
+        after = [v for v in values if v > 0]
+        parts = []
+        t = 0
+        if after:
+            if len(after) == 1:
+                parts.append(self.PHRASES['first'][0] % self.nth(
+                    after[0], self.FEMININ))
+                t += 1
+            else:
+                t += 2
+                parts.append(self.PHRASES['first'][1] % self.join_list(
+                    [self.nth(val) for val in after]))
+        if before:
+            if len(before) == 1:
+                if before[0] == 1:
+                    parts.append(self.PHRASES['last'][0])
+                else:
+                    parts.append(self.PHRASES['last'][1] % (
+                        self.PHRASES['before_last'] * (before[0] - 1)))
+                t += 1
+            else:
+                t += 2
+                parts.append(self.PHRASES['last'][2] % self.join_list(
+                    [self.nth(val) for val in before]))
+
+        return self.PHRASES['setpos'][t != 1] % (
+            self.PHRASES['and'].join(parts))
+
+    def by_monthday(self, values):
+        if len(values) == 1:
+            return self.PHRASES['bymonthday'][0] % self.nth(values[0])
+        return self.PHRASES['bymonthday'][1] % self.join_list(
+            [self.nth(val) for val in values])
+
+    def by_yearday(self, values):
+        if len(values) == 1:
+            return self.PHRASES['byyearday'][0] % self.nth(values[0])
+        return self.PHRASES['byyearday'][1] % self.join_list(
+            [self.nth(val) for val in values])
+
+    def by_easter(self, values):
+        before = [-v for v in reversed(values) if v < 0]
+        after = [v for v in values if v > 0]
+        parts = []
+        if before:
+            if len(before) == 1 and before[0] == 1:
+                parts.append(self.PHRASES['before_easter'][0])
+            else:
+                parts.append(
+                    self.PHRASES['before_easter'][1] % self.join_list(before))
+        if after:
+            if len(after) == 1 and after[0] == 1:
+                parts.append(self.PHRASES['after_easter'][0])
+            else:
+                parts.append(
+                    self.PHRASES['after_easter'][1] % self.join_list(after))
+
+        return self.PHRASES['and'].join(parts)
 
-    def since(self, dtstart, tzinfo):
-        return 'depuis le %s' % self.format_dt(dtstart, tzinfo)
 
-    def until(self, until):
-        return 'jusqu’au %s' % self.format_dt(until)
+def capitalize(s):
+    if not len(s):
+        return ''
+    # Replacing the first character copies long descriptions only once
+    return s.replace(s[0], s[0].upper(), 1)
 
-    def by(self, by, values):
-        if by == 'bysetpos':
-            before = [-v for v in reversed(values) if v < 0]
-            after = [v for v in values if v > 0]
-            parts = []
-            t = 0
-            if after:
-                if len(after) == 1:
-                    parts.append('la %s' % self.nth(after[0], self.FEMININ))
-                    t += 1
-                else:
-                    t += 2
-                    parts.append(
-                    'les %s premières' %
-                    self.join_list([self.nth(val) for val in after]))
-            if before:
-                if len(before) == 1:
-                    if before[0] == 1:
-                        parts.append('la dernière')
-                    else:
-                        parts.append(
-                            'l’%sdernière' % ('avant-' * (before[0] - 1)))
-                    t += 1
-                else:
-                    t += 2
-                    parts.append(
-                        'les %s dernières' %
-                        self.join_list([self.nth(val) for val in before]))
-
-            return ' et '.join(parts) + ' occurence%s' % (
-                's' if t != 1 else '')
-
-        if by == 'bymonth':
-            return 'en %s' % self.join_list([
-                get_month_names(locale=self.__class__.__name__)[month]
-                for month in values
-            ])
-        if by == 'bymonthday':
-            if len(values) == 1:
-                return 'le %s jour du mois' % self.nth(val)
-            return 'les %s jours du mois' % self.join_list(
-                [self.nth(val) for val in values])
-
-        if by == 'byyearday':
-            if len(values) == 1:
-                return 'le %s jour de l’année' % self.nth(val)
-            return 'les %s jours de l’année' % self.join_list(
-                [self.nth(val) for val in values])
-
-        if by == 'byweekno':
-            if len(values) == 1:
-                return 'la semaine n°%d' % values[0]
-            return 'les semaines n°%s' % self.join_list(values)
-
-        if by == 'byweekday':
-            dow = get_day_names(locale=self.__class__.__name__)
-
-            return 'le %s' % self.join_list([
-                 dow[val] for val in values
-            ])
-
-        if by == 'byeaster':
-            before = [-v for v in reversed(values) if v < 0]
-            after = [v for v in values if v > 0]
-            parts = []
-            if before:
-                if len(before) == 1 and before[0] == 1:
-                    parts.append('la veille de Pâques')
-                else:
-                    parts.append(
-                        '%s jours avant Pâques' % self.join_list(before))
-            if after:
-                if len(after) == 1 and after[0] == 1:
-                    parts.append('le lendemain de Pâques')
-                else:
-                    parts.append('%s jours après Pâques' % self.join_list(after))
 
-            return ' et '.join(parts)
+def get_formatter(locale='en_US', date_verbosity='full'):
+    return Lang.formatter(locale, date_verbosity)
 
-    def by_timeset(self, by_timeset):
-        return 'à %s' % self.join_list([
-             format_time(val, locale=self.__class__.__name__)
-             for val in by_timeset
-        ])
 
-    def join_set(self, rrules, rdates, exrules, exdates):
-        parts = []
-        parts.extend(rrules)
-        parts.extend(['le %s' % rd for rd in rdates])
-        parts.extend(['sauf %s' % xr for xr in exrules])
-        parts.extend(['sauf le %s' % xd for xd in exdates])
-        return self.join_list(parts)
+def format_rrule(rr, locale='en_US', date_verbosity='full', **kwargs):
+    return capitalize(
+        get_formatter(locale, date_verbosity).format_rrule(rr, **kwargs))
 
 
-def capitalize(s):
-    if not len(s):
-        return ''
-    if len(s) == 1:
-        return s.upper()
-    return s[0].upper() + s[1:]
+def format_rruleset(rrs, locale='en_US', date_verbosity='full', **kwargs):
+    return capitalize(
+        get_formatter(locale, date_verbosity).format_rruleset(rrs, **kwargs))
+
+
+def format_rrule_string(s, locale='en_US', **kwargs):
+    rule = parse_rrule_string(s)
+    if hasattr(rule, '_rrule'):  # dateutil.rrule.rruleset
+        return format_rruleset(rule, locale, **kwargs)
+    return format_rrule(rule, locale, **kwargs)
+
+
+def format_rrule_multi(
+        rr, locales=('en_US', 'fr_FR'), date_verbosity='full',
+        include_start_date=False):
+    tree = analyze(rr, include_start_date)
+    return {
+        locale: capitalize(get_formatter(locale, date_verbosity).render(tree))
+        for locale in locales}
 
 
-def format_rrule(rr, locale='en_US', **kwargs):
-    return capitalize(Lang[locale].format_rrule(rr, **kwargs))
+def format_rrules(rrs, locale='en_US', date_verbosity='full', **kwargs):
+    lang = get_formatter(locale, date_verbosity)
+    for rr in rrs:
+        yield capitalize(lang.format_rrule(rr, **kwargs))
 
 
-def format_rruleset(rrs, locale='en_US', **kwargs):
-    return capitalize(Lang[locale].format_rruleset(rrs, **kwargs))
+def format_rrulesets(rrss, locale='en_US', date_verbosity='full', **kwargs):
+    lang = get_formatter(locale, date_verbosity)
+    for rrs in rrss:
+        yield capitalize(lang.format_rruleset(rrs, **kwargs))
@@ -0,0 +1,5 @@
+# Same values as the dateutil.rrule constants, without importing dateutil
+YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY, SECONDLY = range(7)
+
+FREQNAMES = (
+    'YEARLY', 'MONTHLY', 'WEEKLY', 'DAILY', 'HOURLY', 'MINUTELY', 'SECONDLY')
@@ -0,0 +1,85 @@
+from .formatting import capitalize, get_formatter
+
+KINDS = ('rrule', 'rdate', 'exrule', 'exdate')
+
+
+class RulesetFormatter(object):
+    """Describe a ruleset edited one component at a time.
+
+    The rendered fragment of every rrule, rdate, exrule and exdate is kept,
+    so an edit only renders the components it adds before the fragments
+    are joined again. Edits go through the methods mirroring the
+    `dateutil.rrule.rruleset` ones, which also update ``self.rruleset``.
+    """
+
+    def __init__(
+            self, rrs=None, locale='en_US', date_verbosity='full',
+            include_start_date=True):
+        if rrs is None:
+            from dateutil.rrule import rruleset
+            rrs = rruleset()
+        self.rruleset = rrs
+        self.lang = get_formatter(locale, date_verbosity)
+        self.include_start_date = include_start_date
+        self.fragments = {
+            'rrule': [self.render('rrule', rr) for rr in rrs._rrule],
+            'rdate': self.lang.format_dts(rrs._rdate),
+            'exrule': [self.render('exrule', rr) for rr in rrs._exrule],
+            'exdate': self.lang.format_dts(rrs._exdate)}
+        self._description = None
+
+    def items(self, kind):
+        return getattr(self.rruleset, '_' + kind)
+
+    def render(self, kind, item):
+        if kind in ('rrule', 'exrule'):
+            return self.lang.format_rrule(item, self.include_start_date)
+        return self.lang.format_dt(item)
+
+    def add(self, kind, item):
+        fragment = self.render(kind, item)
+        getattr(self.rruleset, kind)(item)
+        self.fragments[kind].append(fragment)
+        self._description = None
+
+    def remove(self, kind, item):
+        """Remove the first ``item`` of ``kind``, as `list.remove`."""
+        items = self.items(kind)
+        index = items.index(item)
+        del items[index]
+        del self.fragments[kind][index]
+        if hasattr(self.rruleset, '_invalidate_cache'):
+            self.rruleset._invalidate_cache()
+        self._description = None
+
+    def rrule(self, rr):
+        self.add('rrule', rr)
+
+    def rdate(self, dt):
+        self.add('rdate', dt)
+
+    def exrule(self, rr):
+        self.add('exrule', rr)
+
+    def exdate(self, dt):
+        self.add('exdate', dt)
+
+    def remove_rrule(self, rr):
+        self.remove('rrule', rr)
+
+    def remove_rdate(self, dt):
+        self.remove('rdate', dt)
+
+    def remove_exrule(self, rr):
+        self.remove('exrule', rr)
+
+    def remove_exdate(self, dt):
+        self.remove('exdate', dt)
+
+    def format(self):
+        if self._description is None:
+            self._description = capitalize(self.lang.join_set(
+                *(self.fragments[kind] for kind in KINDS)))
+        return self._description
+
+    __str__ = format
@@ -0,0 +1,401 @@
+"""Find the rules and rulesets with occurrences in a time window.
+
+Rules are pruned in two ways before the exact check:
+
+- Rules ending at a known date are kept in an interval treap ordered by
+  start date, so that only those alive during the window are visited.
+- Rules that never end are kept in buckets by the minutes of the day they
+  can occur at, so that only those firing at the window minutes are
+  visited.
+
+Naive and aware rules are kept apart, as their dates cannot be compared.
+Naive rules are matched in the wall time of the window, aware rules take
+a naive window as UTC. Minutes are only read from naive rules, aware
+rules alive during the window are always candidates.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone
+from itertools import count as counter
+from random import random
+
+from .counting import ONE_MICROSECOND, STEPS, count_through, cycle, rebuild
+from .frequencies import DAILY, HOURLY, MINUTELY, MONTHLY, YEARLY
+from .parsing import as_rrule
+
+MINUTES = 1440
+# Rules firing at more minutes of the day than this are always candidates
+MAX_SLOTS = 360
+
+
+class _Node(object):
+    __slots__ = (
+        'order', 'start', 'end', 'key', 'priority', 'left', 'right',
+        'max_end')
+
+    def __init__(self, order, start, end, key):
+        self.order = order
+        self.start = start
+        self.end = self.max_end = end
+        self.key = key
+        self.priority = random()
+        self.left = self.right = None
+
+    def update(self):
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTreap(object):
+    """Intervals ordered by start, with the latest end of every subtree."""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+        self._orders = counter()
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, start, end, key):
+        """Insert an interval, return the handle used to remove it."""
+        order = (start, next(self._orders))
+        self.root = self._insert(self.root, _Node(order, start, end, key))
+        self.size += 1
+        return order
+
+    def _insert(self, node, new):
+        if node is None:
+            return new
+        if new.order < node.order:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def remove(self, order):
+        self.root = self._remove(self.root, order)
+        self.size -= 1
+
+    def _remove(self, node, order):
+        if node is None:
+            raise KeyError(order)
+        if order < node.order:
+            node.left = self._remove(node.left, order)
+        elif order > node.order:
+            node.right = self._remove(node.right, order)
+        else:
+            return self._merge(node.left, node.right)
+        node.update()
+        return node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    @staticmethod
+    def _rotate_right(node):
+        left = node.left
+        node.left, left.right = left.right, node
+        node.update()
+        left.update()
+        return left
+
+    @staticmethod
+    def _rotate_left(node):
+        right = node.right
+        node.right, right.left = right.left, node
+        node.update()
+        right.update()
+        return right
+
+    def overlapping(self, start, end):
+        """Yield the keys of the intervals overlapping ``[start, end]``."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end < start:
+                continue
+            stack.append(node.left)
+            if node.start <= end:
+                if node.end >= start:
+                    yield node.key
+                stack.append(node.right)
+
+
+def _last_occurrence(rr):
+    """Return when ``rr`` ends, or None when unknown or never."""
+    end = rr._until
+    if rr._count is not None and not any(rr._original_rule.values()):
+        steps = (rr._count - 1) * rr._interval
+        if rr._freq in STEPS:
+            last = rr._dtstart + timedelta(seconds=STEPS[rr._freq] * steps)
+        elif rr._freq == MONTHLY and rr._dtstart.day <= 28:
+            month = rr._dtstart.month - 1 + steps
+            last = rr._dtstart.replace(
+                year=rr._dtstart.year + month // 12, month=month % 12 + 1)
+        elif rr._freq == YEARLY and (
+                rr._dtstart.month, rr._dtstart.day) != (2, 29):
+            last = rr._dtstart.replace(year=rr._dtstart.year + steps)
+        else:
+            return end
+        end = last if end is None else min(end, last)
+    return end
+
+
+def _rule_slots(rr):
+    """Return the minutes of the day ``rr`` can occur at, None for any."""
+    rr = as_rrule(rr)
+    if rr._tzinfo is not None:
+        return None
+    if rr._freq <= DAILY:
+        return {time.hour * 60 + time.minute for time in rr._timeset}
+    if rr._freq == HOURLY:
+        hours, minutes = rr._byhour or range(24), rr._byminute
+    elif rr._freq == MINUTELY:
+        hours, minutes = rr._byhour or range(24), rr._byminute or range(60)
+    else:
+        if rr._byhour is None and rr._byminute is None:
+            return None
+        hours, minutes = rr._byhour or range(24), rr._byminute or range(60)
+    if len(hours) * len(minutes) > MAX_SLOTS:
+        return None
+    return {hour * 60 + minute for hour in hours for minute in minutes}
+
+
+def _entry(rule):
+    """Return the ``(start, end, slots)`` bounds of a rule or ruleset."""
+    if not hasattr(rule, '_rrule'):
+        return rule._dtstart, _last_occurrence(rule), _rule_slots(rule)
+    starts, ends, slots = [], [], set()
+    for rr in rule._rrule:
+        starts.append(rr._dtstart)
+        ends.append(_last_occurrence(rr))
+        rr_slots = _rule_slots(rr)
+        slots = None if slots is None or rr_slots is None else (
+            slots | rr_slots)
+    for rdate in rule._rdate:
+        starts.append(rdate)
+        ends.append(rdate)
+        if slots is not None and rdate.tzinfo is None:
+            slots.add(rdate.hour * 60 + rdate.minute)
+        else:
+            slots = None
+    if not starts:
+        return None, None, set()
+    return min(starts), None if None in ends else max(ends), slots
+
+
+def _window_slots(start, end):
+    if end - start >= timedelta(days=1):
+        return None
+    first = start.hour * 60 + start.minute
+    last = end.hour * 60 + end.minute
+    if last >= first and end.date() == start.date():
+        return range(first, last + 1)
+    return list(range(first, MINUTES)) + list(range(last + 1))
+
+
+def _window(start, end, aware):
+    """Return ``[start, end]`` as aware datetimes, or as naive ones."""
+    if not aware:
+        return start.replace(tzinfo=None), end.replace(tzinfo=None)
+    if start.tzinfo is None:
+        return start.replace(tzinfo=timezone.utc), end.replace(
+            tzinfo=timezone.utc)
+    return start, end
+
+
+def _window_rule(rr, start, end):
+    """Return a rule with the occurrences of ``rr`` in ``[start, end]``.
+
+    Rules repeating at a short cycle are moved to the last cycle starting
+    before ``start``, so that dateutil does not iterate from their start.
+    Other rules are returned as they are.
+    """
+    period = cycle(rr) if rr._count is None else None
+    if period is None or start <= rr._dtstart:
+        return rr
+    if rr._until is not None and rr._until < end:
+        end = rr._until
+    return rebuild(
+        rr, rr._dtstart + (start - rr._dtstart) // period * period, end)
+
+
+def occurs_between(rr, start, end):
+    """Tell whether rrule ``rr`` occurs in ``[start, end]``."""
+    if rr._until is not None and rr._until < end:
+        end = rr._until
+    if end < start or end < rr._dtstart:
+        return False
+    if rr._count is None:
+        window_rule = _window_rule(rr, start, end)
+        if window_rule is rr:
+            try:
+                from .expansion import expand, supported
+            except ImportError:  # No NumPy
+                pass
+            else:
+                if supported(rr):
+                    return len(expand(rr, start, end, inc=True, limit=1)) > 0
+        occurrence = window_rule.after(start, inc=True)
+        return occurrence is not None and occurrence <= end
+    before = count_through(rr, start - ONE_MICROSECOND)
+    if before >= rr._count:
+        return False
+    return count_through(rr, end) > before
+
+
+def _between(rr, start, end):
+    window_rule = _window_rule(rr, start, end)
+    if window_rule is rr:
+        try:
+            from .expansion import expand, supported
+        except ImportError:  # No NumPy
+            pass
+        else:
+            if supported(rr):
+                return expand(rr, start, end, inc=True).tolist()
+    return window_rule.between(start, end, inc=True)
+
+
+def ruleset_occurs_between(rrs, start, end):
+    """Tell whether rruleset ``rrs`` occurs in ``[start, end]``."""
+    occurrences = {dt for dt in rrs._rdate if start <= dt <= end}
+    for rr in rrs._rrule:
+        occurrences.update(_between(rr, start, end))
+    if not occurrences:
+        return False
+    occurrences.difference_update(rrs._exdate)
+    for rr in rrs._exrule:
+        if not occurrences:
+            break
+        occurrences.difference_update(_between(rr, start, end))
+    return bool(occurrences)
+
+
+class RuleIndex(object):
+    """Index rrules and rrulesets by key to find those firing in a window.
+
+    ``rules`` is an iterable of ``(key, rule)`` pairs to add.
+    """
+
+    def __init__(self, rules=()):
+        self.entries = {}
+        self.bounded = IntervalTreap()
+        self.slots = defaultdict(set)
+        self.anytime = set()
+        self.aware_bounded = IntervalTreap()
+        self.aware = set()
+        for key, rule in rules:
+            self.add(key, rule)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, key, rule):
+        # Parsed records do not hold what occurrences are computed from
+        rule = as_rrule(rule)
+        if key in self.entries:
+            self.remove(key)
+        start, end, slots = _entry(rule)
+        if start is None:  # Empty ruleset
+            self.entries[key] = (rule, None, None, None, slots)
+            return
+        order = None
+        aware = start.tzinfo is not None
+        if end is not None:
+            order = (self.aware_bounded if aware else self.bounded).insert(
+                start, end, key)
+        elif aware:
+            self.aware.add(key)
+        elif slots is None:
+            self.anytime.add(key)
+        else:
+            for slot in slots:
+                self.slots[slot].add(key)
+        self.entries[key] = (rule, order, start, end, slots)
+
+    def remove(self, key):
+        rule, order, start, end, slots = self.entries.pop(key)
+        if start is None:
+            return
+        aware = start.tzinfo is not None
+        if order is not None:
+            (self.aware_bounded if aware else self.bounded).remove(order)
+        elif aware:
+            self.aware.discard(key)
+        elif slots is None:
+            self.anytime.discard(key)
+        else:
+            for slot in slots:
+                bucket = self.slots[slot]
+                bucket.discard(key)
+                if not bucket:
+                    del self.slots[slot]
+
+    def candidates(self, start, end):
+        """Yield the keys of the rules that may occur in ``[start, end]``."""
+        entries = self.entries
+        aware_start, aware_end = _window(start, end, True)
+        yield from self.aware_bounded.overlapping(aware_start, aware_end)
+        for key in self.aware:
+            if entries[key][2] <= aware_end:
+                yield key
+        start, end = _window(start, end, False)
+        window_slots = _window_slots(start, end)
+        for key in self.bounded.overlapping(start, end):
+            slots = self.entries[key][4]
+            if window_slots is None or slots is None or not (
+                    slots.isdisjoint(window_slots)):
+                yield key
+        for key in self.anytime:
+            if entries[key][2] <= end:
+                yield key
+        if window_slots is None:
+            keys = set().union(*self.slots.values())
+        else:
+            keys = set()
+            for slot in window_slots:
+                keys.update(self.slots.get(slot, ()))
+        for key in keys:
+            if entries[key][2] <= end:
+                yield key
+
+    def query(self, start, end, exact=True):
+        """Return the keys of the rules occurring in ``[start, end]``.
+
+        Without ``exact``, the candidates are returned unchecked.
+        """
+        keys = []
+        for key in self.candidates(start, end):
+            rule, _, rule_start = self.entries[key][:3]
+            if exact:
+                window = _window(start, end, rule_start.tzinfo is not None)
+                if not (
+                        ruleset_occurs_between(rule, *window)
+                        if hasattr(rule, '_rrule') else
+                        occurs_between(rule, *window)):
+                    continue
+            keys.append(key)
+        return keys
@@ -0,0 +1,130 @@
+import tracemalloc
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from .analysis import BY_RULES
+from .formatting import Lang
+
+STAGES = (
+    'every', 'since', 'until', 'by', 'by_timeset', 'count', 'format_dt')
+# Compiled render plans call the by-rule methods directly, and rulesets
+# format their dates in bulk
+METHODS = tuple((stage, stage) for stage in STAGES if stage != 'by') + tuple(
+    ('by_' + by[2:], 'by') for by in BY_RULES) + (
+    ('format_dts', 'format_dt'),)
+
+_originals = {}
+
+MemoryStats = namedtuple('MemoryStats', ('peak', 'size', 'blocks'))
+
+
+class StageStats(object):
+    """Collect call counts and cumulative time per locale and stage.
+
+    Stages nest: the time spent in ``format_dt`` while rendering ``since``
+    and ``until`` is counted in both stages.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def __call__(self, locale, stage, elapsed):
+        with self._lock:
+            stats = self._stats[locale][stage]
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def reset(self):
+        with self._lock:
+            self._stats = defaultdict(lambda: defaultdict(lambda: [0, 0.]))
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                locale: {
+                    stage: {'calls': calls, 'time': time}
+                    for stage, (calls, time) in stages.items()}
+                for locale, stages in self._stats.items()}
+
+
+def _timed(function, stage, hook):
+    @wraps(function)
+    def timed(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            hook(self.__class__.__name__, stage, perf_counter() - start)
+    return timed
+
+
+def enable(hook):
+    """Call ``hook(locale, stage, elapsed)`` around every formatting stage.
+
+    Stage methods are wrapped in place, so nothing is paid until this is
+    called and nothing remains after `disable`. The locale is read from the
+    formatter at call time, so languages loaded later are timed too.
+    """
+    if _originals:
+        raise RuntimeError('Instrumentation is already enabled')
+    for cls in (Lang,) + tuple(Lang.languages.values()):
+        for method, stage in METHODS:
+            if method in cls.__dict__:
+                _originals[cls, method] = cls.__dict__[method]
+                setattr(cls, method, _timed(
+                    cls.__dict__[method], stage, hook))
+    Lang.clear_plans()
+
+
+def disable():
+    for (cls, method), original in _originals.items():
+        setattr(cls, method, original)
+    _originals.clear()
+    Lang.clear_plans()
+
+
+@contextmanager
+def instrumented(hook=None):
+    hook = StageStats() if hook is None else hook
+    enable(hook)
+    try:
+        yield hook
+    finally:
+        disable()
+
+
+def measure_memory(function, *args, **kwargs):
+    """Call ``function``, return its result and its `MemoryStats`.
+
+    ``peak`` is the most memory the call held at once, in bytes; ``size``
+    and ``blocks`` are the bytes and memory blocks it left allocated, the
+    result included, counted from `tracemalloc` snapshots taken around the
+    call. Memory is traced with `tracemalloc`, started for the call if
+    needed.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        reset_peak = getattr(tracemalloc, 'reset_peak', None)
+        if reset_peak is None:  # Python < 3.9
+            tracemalloc.clear_traces()
+        before = tracemalloc.take_snapshot()
+        if reset_peak is not None:
+            reset_peak()
+        size, _ = tracemalloc.get_traced_memory()
+        result = function(*args, **kwargs)
+        end_size, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    # Leave out the snapshot objects themselves
+    ignored = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    blocks = sum(stat.count_diff for stat in after.filter_traces(
+        ignored).compare_to(before.filter_traces(ignored), 'filename'))
+    return result, MemoryStats(peak - size, end_size - size, blocks)
@@ -0,0 +1,74 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+
+from dateutil.rrule import rrule, rruleset
+
+from .formatting import capitalize, get_formatter
+from .parsing import parse_rrule_string
+from .preload import warm_formatter
+
+_worker_lang = None
+
+
+def parse_rule(rule):
+    if isinstance(rule, str):
+        return parse_rrule_string(rule)
+    if isinstance(rule, dict):
+        return rrule(**rule)
+    return rule
+
+
+def format_rule(lang, rule, **kwargs):
+    rule = parse_rule(rule)
+    if isinstance(rule, rruleset):
+        return capitalize(lang.format_rruleset(rule, **kwargs))
+    return capitalize(lang.format_rrule(rule, **kwargs))
+
+
+def _init_worker(locale, date_verbosity):
+    global _worker_lang
+    _worker_lang = warm_formatter(get_formatter(locale, date_verbosity))
+
+
+def _format_chunk(rules, kwargs, return_exceptions=False):
+    if not return_exceptions:
+        return [format_rule(_worker_lang, rule, **kwargs) for rule in rules]
+    results = []
+    for rule in rules:
+        try:
+            results.append(format_rule(_worker_lang, rule, **kwargs))
+        except Exception as exception:
+            results.append(exception)
+    return results
+
+
+def iformat_bulk(
+        rules, locale='en_US', date_verbosity='full', chunksize=512,
+        max_workers=None, return_exceptions=False, **kwargs):
+    """Yield the descriptions of ``rules``, in order.
+
+    With ``return_exceptions``, the exception raised by an invalid rule is
+    yielded in place of its description, instead of being raised.
+    """
+    max_workers = max_workers or cpu_count() or 1
+    rules = iter(rules)
+    with ProcessPoolExecutor(
+            max_workers, initializer=_init_worker,
+            initargs=(locale, date_verbosity)) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * max_workers:
+                chunk = list(islice(rules, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(
+                    _format_chunk, chunk, kwargs, return_exceptions))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def format_bulk(rules, locale='en_US', **kwargs):
+    return list(iformat_bulk(rules, locale=locale, **kwargs))
@@ -0,0 +1,177 @@
+from datetime import datetime, time
+
+from .frequencies import FREQNAMES, HOURLY
+
+FREQUENCIES = {name: freq for freq, name in enumerate(FREQNAMES)}
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+
+class RuleRecord(object):
+    """Lightweight stand-in for the rrule attributes read by formatters.
+
+    Records only hold what descriptions need: use `to_rrule` to compute
+    their occurrences. ``byday`` keeps the ``(weekday, n)`` pairs of BYDAY,
+    whose occurrence numbers are not in ``original_rule``.
+    """
+
+    __slots__ = (
+        '_freq', '_interval', '_count', '_until', '_wkst', '_dtstart',
+        '_tzinfo', '_original_rule', '_timeset', '_byday')
+
+    def __init__(
+            self, freq, interval=1, count=None, until=None, wkst=0,
+            dtstart=None, original_rule=None, timeset=None, byday=None):
+        self._freq = freq
+        self._interval = interval
+        self._count = count
+        self._until = until
+        self._wkst = wkst
+        self._dtstart = dtstart
+        self._tzinfo = None
+        self._original_rule = original_rule or {}
+        self._timeset = timeset
+        self._byday = byday
+
+    def to_rrule(self):
+        """Return the `dateutil.rrule.rrule` this record stands for."""
+        from dateutil.rrule import rrule, weekday
+
+        by_rules = dict(self._original_rule)
+        if self._byday is not None:
+            by_rules['byweekday'] = [
+                weekday(day, n) for day, n in self._byday]
+        return rrule(
+            self._freq, dtstart=self._dtstart, interval=self._interval,
+            wkst=self._wkst, count=self._count, until=self._until,
+            **by_rules)
+
+
+def as_rrule(rule):
+    """Return ``rule``, as a dateutil rule if it is a `RuleRecord`."""
+    if isinstance(rule, RuleRecord):
+        return rule.to_rrule()
+    return rule
+
+
+def _ints(value):
+    return [int(v) for v in value.split(',')]
+
+
+def _sorted_set(value):
+    return tuple(sorted(set(_ints(value))))
+
+
+def _weekdays(value):
+    # Occurrence numbers such as +1MO are not part of descriptions, but
+    # dateutil keeps MO and +1MO apart: such rules are left to it
+    weekdays = [WEEKDAYS[v[-2:]] for v in value.split(',')]
+    if len(set(weekdays)) != len(weekdays):
+        raise ValueError(value)
+    return tuple(sorted(weekdays))
+
+
+def _byday(value):
+    byday = tuple(
+        (WEEKDAYS[v[-2:]], int(v[:-2]) if v[:-2] else None)
+        for v in value.split(','))
+    if any(n == 0 for _, n in byday):
+        raise ValueError(value)
+    return byday
+
+
+def _setpos(value):
+    values = tuple(_ints(value))
+    if not all(1 <= abs(v) <= 366 for v in values):
+        raise ValueError(value)
+    return values
+
+
+def _monthdays(value):
+    values = set(_ints(value))
+    return tuple(sorted(v for v in values if v > 0)) + tuple(
+        sorted(v for v in values if v < 0))
+
+
+def _until(value):
+    if len(value) == 8:
+        return datetime(int(value[:4]), int(value[4:6]), int(value[6:]))
+    if len(value) == 15 and value[8] == 'T':
+        return datetime(
+            int(value[:4]), int(value[4:6]), int(value[6:8]),
+            int(value[9:11]), int(value[11:13]), int(value[13:]))
+    raise ValueError(value)
+
+
+BY_PARSERS = {
+    'BYSETPOS': ('bysetpos', _setpos),
+    'BYMONTH': ('bymonth', _sorted_set),
+    'BYMONTHDAY': ('bymonthday', _monthdays),
+    'BYYEARDAY': ('byyearday', _sorted_set),
+    'BYWEEKNO': ('byweekno', _sorted_set),
+    'BYDAY': ('byweekday', _weekdays),
+    'BYEASTER': ('byeaster', _sorted_set),
+    'BYHOUR': ('byhour', _sorted_set),
+    'BYMINUTE': ('byminute', _sorted_set),
+    'BYSECOND': ('bysecond', _sorted_set),
+}
+
+
+def _parse_record(line):
+    line = line.upper()
+    if line.startswith('RRULE:'):
+        line = line[6:]
+    if ':' in line:
+        raise ValueError(line)
+    freq = None
+    interval = 1
+    count = until = None
+    wkst = 0
+    original_rule = {}
+    byday = None
+    for part in line.split(';'):
+        name, value = part.split('=', 1)
+        if name == 'FREQ':
+            freq = FREQUENCIES[value]
+        elif name == 'INTERVAL':
+            interval = int(value)
+        elif name == 'COUNT':
+            count = int(value)
+        elif name == 'UNTIL':
+            until = _until(value)
+        elif name == 'WKST':
+            wkst = WEEKDAYS[value]
+        else:
+            by, parse = BY_PARSERS[name]
+            original_rule[by] = parse(value)
+            if name == 'BYDAY':
+                byday = _byday(value)
+    if freq is None:
+        raise ValueError(line)
+
+    dtstart = datetime.now().replace(microsecond=0)
+    timeset = None
+    if freq < HOURLY:
+        timeset = tuple(
+            time(hour, minute, second)
+            for hour in original_rule.get('byhour', (dtstart.hour,))
+            for minute in original_rule.get('byminute', (dtstart.minute,))
+            for second in original_rule.get('bysecond', (dtstart.second,)))
+    return RuleRecord(
+        freq, interval, count, until, wkst, dtstart, original_rule, timeset,
+        byday)
+
+
+def parse_rrule_string(s):
+    """Parse a single RRULE into a `RuleRecord`.
+
+    Anything the fast parser does not handle (DTSTART, RDATE, time zones,
+    multiple lines...) is delegated to `dateutil.rrule.rrulestr`.
+    """
+    s = s.strip()
+    if '\n' not in s:
+        try:
+            return _parse_record(s)
+        except (KeyError, ValueError):
+            pass
+    from dateutil.rrule import rrulestr
+    return rrulestr(s)
@@ -0,0 +1,70 @@
+import gc
+from datetime import datetime
+
+from .analysis import BY_RULES
+from .formatting import DATE_VERBOSITIES, Lang, get_formatter
+from .frequencies import DAILY, MONTHLY
+from .parsing import RuleRecord
+
+# Values accepted by every by-rule phrase, in every language
+SAMPLE_VALUES = {
+    'bysetpos': (-1, 1), 'bymonth': (1, 2), 'bymonthday': (1, 2),
+    'byyearday': (1, 2), 'byweekno': (1, 2), 'byweekday': (0, 1),
+    'byeaster': (-1, 1)}
+SAMPLE_DATE = datetime(2000, 1, 3, 12)
+
+
+def sample_rules():
+    """Yield rules covering the common shapes and every phrase."""
+    for interval in (1, 2):
+        for count in (None, 3):
+            yield RuleRecord(DAILY, interval, count)
+            for by in BY_RULES:
+                yield RuleRecord(
+                    MONTHLY, interval, count,
+                    original_rule={by: SAMPLE_VALUES[by]})
+
+
+def warm_formatter(lang, timezones=()):
+    """Load every table, pattern and render plan ``lang`` can need."""
+    for rule in sample_rules():
+        lang.format_rrule(rule)
+    lang.format_rrule(RuleRecord(
+        MONTHLY, 2, until=SAMPLE_DATE, dtstart=SAMPLE_DATE,
+        original_rule=SAMPLE_VALUES), include_start_date=True)
+    for item in (
+            ('date', SAMPLE_DATE), ('range', SAMPLE_DATE, SAMPLE_DATE),
+            ('group', 2, SAMPLE_DATE, 'month'), ('more', 2)):
+        lang.summary(item)
+    for tzinfo in timezones:
+        # Winter and summer, to get both names of zones with DST
+        for month in (1, 7):
+            lang.format_dt(SAMPLE_DATE.replace(month=month), tzinfo)
+    return lang
+
+
+def warmup(
+        locales=None, verbosities=DATE_VERBOSITIES, timezones=(),
+        freeze=False):
+    """Preload formatters before forking worker processes.
+
+    Formatters for every (locale, date verbosity) pair are created in the
+    shared registry and exercised, so that workers inherit loaded locale
+    data, compiled patterns, time zone names and render plans. With
+    ``freeze``, every object tracked by the garbage collector, not only
+    the formatters, is then moved out of its reach, so that collections in
+    workers do not touch (and copy) their memory pages; frozen objects are
+    never collected.
+    """
+    # Fallback paths import these on first use otherwise
+    import babel.numbers  # noqa
+    import dateutil.rrule  # noqa
+
+    formatters = [
+        warm_formatter(get_formatter(locale, date_verbosity), timezones)
+        for locale in locales or sorted(Lang.languages)
+        for date_verbosity in verbosities]
+    if freeze and hasattr(gc, 'freeze'):
+        gc.collect()
+        gc.freeze()
+    return formatters
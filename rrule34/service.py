@@ -0,0 +1,315 @@
+"""Share warm formatters between clients through an asyncio server.
+
+    python -m rrule34.service [--unix PATH | --host HOST --port PORT]
+
+Clients send one JSON object per line, ``{"rule": "FREQ=DAILY", "locale":
+"fr_FR", "date_verbosity": "short", "include_start_date": false}``, and
+get back ``{"description": ...}`` or ``{"error": ...}`` lines, in order.
+``{"stats": true}`` returns the service statistics.
+
+Identical requests in flight share a single formatting. Other requests are
+gathered for up to ``batch_delay`` seconds, or ``batch_size`` requests, and
+formatted by batches in a process pool. Clients wait when ``max_queue``
+requests are queued, or ``max_batches`` batches are being formatted, and
+the service stops reading a connection with ``pipeline`` requests waiting
+for their replies.
+"""
+import argparse
+import asyncio
+import json
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from time import perf_counter
+
+from .formatting import DATE_VERBOSITIES, Lang, get_formatter
+from .parallel import format_rule
+
+OPTIONS = ('include_start_date',)
+
+
+def _init_worker(locales):
+    from .preload import warmup
+
+    warmup(locales, DATE_VERBOSITIES)
+
+
+def _error(exception):
+    return '%s: %s' % (exception.__class__.__name__, exception)
+
+
+def _format_batch(locale, date_verbosity, options, rules):
+    lang = get_formatter(locale, date_verbosity)
+    results = []
+    for rule in rules:
+        try:
+            results.append((True, format_rule(lang, rule, **dict(options))))
+        except Exception as exception:
+            results.append((False, _error(exception)))
+    return results
+
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+
+class DescriptionService(object):
+    """Format rule strings with request coalescing and micro-batching.
+
+    ``executor`` defaults to a process pool whose workers preload
+    ``locales``. Only the available languages and the standard date
+    verbosities are accepted. Latencies of the last ``window`` requests
+    are kept for the statistics.
+    """
+
+    def __init__(
+            self, executor=None, max_workers=None, locales=None,
+            batch_size=256, batch_delay=.002, window=10000,
+            max_queue=10000, max_batches=None, pipeline=64):
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=(locales,))
+        self.locales = frozenset(Lang.available())
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_queue = max_queue
+        self.max_batches = max_batches or 2 * (
+            max_workers or cpu_count() or 1)
+        self.pipeline = pipeline
+        self.pending = {}
+        self.queue = None
+        self.batches = None
+        self.batcher = None
+        self.latencies = deque(maxlen=window)
+        self.counters = defaultdict(int)
+
+    async def start(self):
+        # Start and warm the workers now, so that they are not forked later
+        # with the client sockets open
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, int)
+        self.queue = asyncio.Queue(self.max_queue)
+        self.batches = asyncio.Semaphore(self.max_batches)
+        self.batcher = asyncio.ensure_future(self._batch_forever())
+
+    async def close(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def describe(
+            self, rule, locale='en_US', date_verbosity='full', **options):
+        """Return the description of the ``rule`` string."""
+        # Every new locale or pattern would stay cached in every worker
+        if locale not in self.locales:
+            raise ValueError('Unknown locale: %r' % (locale,))
+        if date_verbosity not in DATE_VERBOSITIES:
+            raise ValueError(
+                'Unknown date verbosity: %r' % (date_verbosity,))
+        unknown = set(options) - set(OPTIONS)
+        if unknown:
+            raise TypeError(
+                'Unknown options: %s' % ', '.join(sorted(unknown)))
+        for name, value in options.items():
+            if not isinstance(value, bool):
+                raise TypeError('%s must be a boolean' % name)
+        start = perf_counter()
+        self.counters['requests'] += 1
+        key = (rule, locale, date_verbosity, tuple(sorted(options.items())))
+        future = self.pending.get(key)
+        if future is None:
+            future = self.pending[key] = (
+                asyncio.get_running_loop().create_future())
+            # Shielded, so that the request is queued for the clients
+            # coalescing on it even if this one is cancelled while waiting
+            await asyncio.shield(self.queue.put(key))
+            self.counters['max_queue_depth'] = max(
+                self.counters['max_queue_depth'], self.queue.qsize())
+        else:
+            self.counters['coalesced'] += 1
+        try:
+            # Shielded, so that a cancelled client does not cancel the
+            # other ones waiting for the same description
+            return await asyncio.shield(future)
+        finally:
+            self.latencies.append(perf_counter() - start)
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        deadline = perf_counter() + self.batch_delay
+        while len(batch) < self.batch_size:
+            timeout = deadline - perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_forever(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            groups = defaultdict(list)
+            for key in batch:
+                groups[key[1:]].append(key)
+            self.counters['batches'] += 1
+            self.counters['batched'] += len(batch)
+            for (locale, date_verbosity, options), keys in groups.items():
+                await self.batches.acquire()
+                try:
+                    future = loop.run_in_executor(
+                        self.executor, _format_batch, locale,
+                        date_verbosity, options, [key[0] for key in keys])
+                except Exception as exception:  # Broken or closed pool
+                    self.batches.release()
+                    self._set_results(keys, [
+                        (False, _error(exception))] * len(keys))
+                    continue
+                future.add_done_callback(
+                    lambda future, keys=keys: self._resolve(keys, future))
+
+    def _resolve(self, keys, batch_future):
+        self.batches.release()
+        try:
+            results = batch_future.result()
+        except Exception as exception:
+            results = [(False, _error(exception))] * len(keys)
+        self._set_results(keys, results)
+
+    def _set_results(self, keys, results):
+        for key, (success, result) in zip(keys, results):
+            future = self.pending.pop(key)
+            if future.done():
+                continue
+            if success:
+                future.set_result(result)
+            else:
+                self.counters['errors'] += 1
+                future.set_exception(ValueError(result))
+
+    def stats(self):
+        stats = {
+            name: self.counters[name] for name in (
+                'requests', 'coalesced', 'batches', 'errors',
+                'max_queue_depth')}
+        stats['queue_depth'] = self.queue.qsize() if self.queue else 0
+        stats['in_flight'] = len(self.pending)
+        stats['mean_batch_size'] = (
+            self.counters['batched'] / self.counters['batches']
+            if self.counters['batches'] else 0)
+        if self.latencies:
+            stats['latency'] = {
+                'p%d' % percent: _percentile(self.latencies, percent)
+                for percent in (50, 90, 99)}
+            stats['latency']['max'] = max(self.latencies)
+        return stats
+
+    async def handle(self, reader, writer):
+        """Answer the JSON lines of a client connection, in order."""
+        # Bounded, so that a client sending requests without reading the
+        # replies is not read any further
+        replies = asyncio.Queue(self.pipeline)
+
+        async def write_replies():
+            connected = True
+            while True:
+                reply = await replies.get()
+                if reply is None:
+                    break
+                if not connected:
+                    reply.cancel()
+                    continue
+                try:
+                    writer.write(json.dumps(
+                        await reply, ensure_ascii=False
+                    ).encode('utf-8') + b'\n')
+                    await writer.drain()
+                except ConnectionError:
+                    # Replies are still taken, so that reading never waits
+                    # for a closed connection
+                    connected = False
+
+        writing = asyncio.ensure_future(write_replies())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await replies.put(asyncio.ensure_future(self.reply(line)))
+        finally:
+            await replies.put(None)
+            await writing
+            writer.close()
+
+    async def reply(self, line):
+        try:
+            request = json.loads(line.decode('utf-8'))
+            if request.get('stats'):
+                return {'stats': self.stats()}
+            return {'description': await self.describe(
+                request['rule'], request.get('locale', 'en_US'),
+                request.get('date_verbosity', 'full'), **{
+                    name: request[name] for name in OPTIONS
+                    if name in request})}
+        except Exception as exception:
+            return {'error': _error(exception)}
+
+
+async def serve(service, path=None, host='127.0.0.1', port=8034):
+    """Serve ``service`` on a Unix socket at ``path``, or on TCP."""
+    async with service:
+        if path is None:
+            server = await asyncio.start_server(service.handle, host, port)
+        else:
+            server = await asyncio.start_unix_server(service.handle, path)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--unix', help='Unix socket path')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8034)
+    parser.add_argument('--workers', type=int, help='worker processes')
+    parser.add_argument(
+        '--locale', action='append', help='locales to preload (default all)')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument(
+        '--batch-delay', type=float, default=2,
+        help='milliseconds to wait for a batch to fill')
+    parser.add_argument(
+        '--max-queue', type=int, default=10000,
+        help='queued requests before clients wait')
+    parser.add_argument(
+        '--pipeline', type=int, default=64,
+        help='requests of a connection waiting for replies before it is '
+        'not read')
+    args = parser.parse_args(argv)
+    service = DescriptionService(
+        max_workers=args.workers, locales=args.locale,
+        batch_size=args.batch_size, batch_delay=args.batch_delay / 1000,
+        max_queue=args.max_queue, pipeline=args.pipeline)
+    try:
+        asyncio.run(serve(service, args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
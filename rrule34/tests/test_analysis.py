@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from dateutil.rrule import DAILY, MO, MONTHLY, WEEKLY, YEARLY, rrule
+
+from ..analysis import analyze
+from ..formatting import Lang, format_rrule, format_rrule_multi
+
+
+def test_analyze():
+    tree = analyze(rrule(
+        freq=MONTHLY, interval=2, count=4, bysetpos=(1, -1),
+        byweekday=(MO(+1), 4, 2)))
+    assert (tree.freq, tree.interval, tree.count, tree.until) == (
+        MONTHLY, 2, 4, None)
+    assert tree.by == (('bysetpos', (-1, 1)), ('byweekday', (0, 2, 4)))
+    assert tree.dtstart is None
+
+
+def test_analyze_start_date():
+    dtstart = datetime(2000, 1, 2, 12)
+    assert analyze(rrule(freq=WEEKLY, dtstart=dtstart)).dtstart is None
+    assert analyze(
+        rrule(freq=WEEKLY, dtstart=dtstart), True).dtstart == dtstart
+
+
+def test_format_rrule_multi():
+    rr = rrule(
+        freq=YEARLY, dtstart=datetime(2000, 1, 2, 12), bymonth=(3, 1))
+    assert format_rrule_multi(rr) == {
+        'en_US': 'Every year on January and March',
+        'fr_FR': 'Tous les ans en janvier et mars',
+    }
+    descriptions = format_rrule_multi(
+        rr, locales=['fr_FR'], date_verbosity='short',
+        include_start_date=True)
+    assert descriptions == {
+        'fr_FR': 'Tous les ans depuis le 02/01/2000 12:00 en janvier et mars'}
+    assert descriptions['fr_FR'] == format_rrule(
+        rr, 'fr_FR', date_verbosity='short', include_start_date=True)
+
+
+def test_render_plans():
+    lang = Lang.formatter('en_US')
+    lang.plans.clear()
+    first = analyze(rrule(freq=WEEKLY, byweekday=(0, 2), count=3))
+    second = analyze(rrule(freq=DAILY, byweekday=4, count=12))
+    assert first.shape == second.shape
+    assert lang.render(first) == (
+        'every week on Monday and Wednesday only 3 times')
+    assert lang.render(second) == 'every day on Friday only 12 times'
+    assert list(lang.plans) == [first.shape]
+    assert lang.render(analyze(rrule(freq=DAILY, interval=3))) == (
+        'every 3 days')
+    assert len(lang.plans) == 2
+
+
+def test_by_dispatch():
+    lang = Lang.formatter('fr_FR')
+    assert lang.by('bymonthday', [3]) == 'le 3ème jour du mois'
+    assert lang.by('byyearday', [1]) == 'le 1er jour de l’année'
@@ -0,0 +1,30 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from pytz import timezone
+
+from ..formatting import DATE_VERBOSITIES, Lang, get_formatter
+
+START = datetime(2020, 3, 27, 22, 30, 15)
+DTS = [START + timedelta(hours=7 * i) for i in range(60)] + [
+    date(2020, 3, 29), START, START.replace(microsecond=123456)]
+PARIS = timezone('Europe/Paris')
+
+
+@pytest.mark.parametrize('locale', sorted(Lang.languages))
+@pytest.mark.parametrize('date_verbosity', DATE_VERBOSITIES + ('y-MM-dd H',))
+def test_format_dts(locale, date_verbosity):
+    lang = get_formatter(locale, date_verbosity)
+    aware = [PARIS.localize(dt) for dt in DTS[:-3]]
+    for dts, tzinfo in ((DTS, None), (DTS, PARIS), (aware, None)):
+        assert lang.format_dts(dts, tzinfo) == [
+            lang.format_dt(dt, tzinfo) for dt in dts]
+
+
+def test_format_dts_numpy():
+    numpy = pytest.importorskip('numpy')
+    lang = get_formatter('fr_FR', 'short')
+    dts = numpy.array(DTS, dtype='datetime64[s]')
+    assert lang.format_dts(dts) == [lang.format_dt(dt) for dt in dts.tolist()]
+    assert lang.format_dts(dts.astype('datetime64[D]'))[:2] == [
+        '27/03/2020 00:00', '28/03/2020 00:00']
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, tzinfo
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule, rruleset
+
+from ..cache import RenderCache, SQLiteCache, rrule_key
+from ..formatting import format_rrule, format_rruleset
+
+
+def test_rrule_key_normalizes_by_values():
+    assert rrule_key(rrule(freq=WEEKLY, byweekday=(0, 2))) == rrule_key(
+        rrule(freq=WEEKLY, byweekday=(2, 0)))
+    assert rrule_key(rrule(freq=MONTHLY, bymonthday=(-1, 3))) == rrule_key(
+        rrule(freq=MONTHLY, bymonthday=(3, -1)))
+    assert rrule_key(rrule(freq=WEEKLY, byweekday=0)) != rrule_key(
+        rrule(freq=WEEKLY, byweekday=1))
+
+
+def test_rrule_key_start_date():
+    dtstart = datetime(2000, 1, 2, 12)
+    first = rrule(freq=DAILY, dtstart=dtstart)
+    second = rrule(freq=DAILY, dtstart=datetime(2001, 1, 2, 12))
+    assert rrule_key(first) == rrule_key(second)
+    assert rrule_key(first, True) != rrule_key(second, True)
+    # Times of day are not described
+    assert rrule_key(first) == rrule_key(
+        rrule(freq=DAILY, dtstart=datetime(2000, 1, 2, 18, 30)))
+    assert rrule_key(first) != rrule_key(first, locale='fr_FR')
+
+
+def test_render_cache_hits():
+    cache = RenderCache()
+    assert format_rrule(
+        rrule(freq=WEEKLY, byweekday=(0, 2)), cache=cache) == (
+            'Every week on Monday and Wednesday')
+    assert format_rrule(
+        rrule(freq=WEEKLY, byweekday=(2, 0)), cache=cache) == (
+            'Every week on Monday and Wednesday')
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_render_cache_evictions():
+    cache = RenderCache(maxsize=2)
+    for interval in (1, 2, 3, 1):
+        format_rrule(rrule(freq=DAILY, interval=interval), cache=cache)
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (
+        0, 4, 2, 2)
+    format_rrule(rrule(freq=DAILY, interval=1), cache=cache)
+    assert cache.info().hits == 1
+
+
+def test_render_cache_context():
+    cache = RenderCache()
+    rr = rrule(freq=YEARLY, bymonth=3)
+    assert format_rrule(rr, cache=cache) == 'Every year on March'
+    assert format_rrule(rr, locale='fr_FR', cache=cache) == (
+        'Tous les ans en mars')
+    assert format_rrule(rr, cache=cache) == 'Every year on March'
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    rr = rrule(freq=DAILY, until=datetime(2030, 12, 25, 11, 25))
+    assert format_rrule(rr, cache=cache) == (
+        'Every day until Wednesday, December 25, 2030 at 11:25:00 AM')
+    assert format_rrule(rr, cache=cache, date_verbosity='short') == (
+        'Every day until 12/25/30, 11:25 AM')
+
+
+def test_render_cache_ruleset():
+    cache = RenderCache()
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=DAILY))
+    rrset.exrule(rrule(freq=DAILY))
+    assert format_rruleset(rrset, include_start_date=False, cache=cache) == (
+        'Every day and except every day')
+    info = cache.info()
+    assert (info.hits, info.misses) == (1, 1)
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 1024, 0)
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / 'descriptions.sqlite')
+    rr = rrule(freq=WEEKLY, byweekday=(0, 2))
+    cache = SQLiteCache(path)
+    assert format_rrule(rr, cache=cache) == (
+        'Every week on Monday and Wednesday')
+    assert format_rrule(rr, locale='fr_FR', cache=cache) == (
+        'Toutes les semaines le lundi et mercredi')
+    assert cache.info() == (0, 2, 0, 100000, 2)
+    cache.close()
+
+    # A restarted process reads what the previous one wrote
+    cache = SQLiteCache(path)
+    assert format_rrule(
+        rrule(freq=WEEKLY, byweekday=(2, 0)), cache=cache) == (
+            'Every week on Monday and Wednesday')
+    assert (cache.info().hits, cache.info().misses) == (1, 0)
+    cache.close()
+
+    # Another version does not read nor drop the descriptions
+    cache = SQLiteCache(path, version='0.0.0')
+    assert format_rrule(rr, cache=cache) == (
+        'Every week on Monday and Wednesday')
+    assert cache.info() == (0, 1, 0, 100000, 3)
+    cache.clear()
+    cache.close()
+
+
+def test_sqlite_cache_bounds(tmp_path, monkeypatch):
+    path = str(tmp_path / 'descriptions.sqlite')
+    now = [1e9]
+    monkeypatch.setattr('rrule34.cache.time', lambda: now[0])
+    cache = SQLiteCache(path, maxsize=3, max_age=3600)
+    for interval in range(1, 6):
+        now[0] += 1
+        format_rrule(rrule(freq=DAILY, interval=interval), cache=cache)
+    assert cache.info().currsize == 5
+    cache.prune()
+    assert cache.info() == (0, 5, 2, 3, 3)
+    format_rrule(rrule(freq=DAILY, interval=5), cache=cache)
+    assert cache.info().hits == 1
+
+    # Expired entries are ignored, then removed when the file is opened
+    now[0] += 3601
+    format_rrule(rrule(freq=DAILY, interval=5), cache=cache)
+    assert cache.info().misses == 6
+    cache.close()
+    cache = SQLiteCache(path, maxsize=3, max_age=3600)
+    assert cache.info() == (0, 0, 2, 3, 1)
+    cache.close()
+
+
+def test_sqlite_cache_stable_keys(tmp_path):
+    class Zone(tzinfo):
+        def utcoffset(self, dt):
+            return timedelta(hours=1)
+
+        def dst(self, dt):
+            return timedelta(0)
+
+        def tzname(self, dt):
+            return 'Zone'
+
+    cache = SQLiteCache(str(tmp_path / 'descriptions.sqlite'))
+    rr = rrule(freq=DAILY, dtstart=datetime(2000, 1, 2, tzinfo=Zone()))
+    for _ in range(2):
+        format_rrule(rr, include_start_date=True, cache=cache)
+    assert cache.info() == (0, 2, 0, 100000, 0)
+    for _ in range(2):
+        format_rrule(rr, cache=cache)
+    assert cache.info() == (1, 3, 0, 100000, 1)
+    cache.close()
@@ -0,0 +1,83 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from ..cli import escape, main, unescape
+
+RULES = (
+    'FREQ=DAILY\n'
+    '\n'
+    'FREQ=WEEKLY;BYDAY=MO,WE\n'
+    'DTSTART:20200101T100000\\nRRULE:FREQ=MONTHLY;COUNT=3\n')
+
+
+def run(tmp_path, content, *args):
+    source, target = tmp_path / 'rules', tmp_path / 'descriptions'
+    source.write_text(content)
+    main([str(source), '--output', str(target)] + list(args))
+    return target.read_text()
+
+
+def test_escapes():
+    for text in ('a', 'a\nb', 'a\\nb', 'a\tb\\', '\\\\\n\r'):
+        assert unescape(escape(text)) == text
+
+
+@pytest.mark.parametrize('args', ([], ['--mmap'], ['--jobs', '2']))
+def test_tsv(tmp_path, args):
+    assert run(tmp_path, RULES, *args) == (
+        'FREQ=DAILY\tEvery day\n'
+        'FREQ=WEEKLY;BYDAY=MO,WE\tEvery week on Monday and Wednesday\n'
+        'DTSTART:20200101T100000\\nRRULE:FREQ=MONTHLY;COUNT=3\t'
+        'Every month only 3 times\n')
+
+
+def test_jsonl_columns(tmp_path):
+    lines = run(
+        tmp_path, '1\tFREQ=DAILY;COUNT=2\n2\tFREQ=YEARLY\n',
+        '--format', 'jsonl', '--column', '2', '--locale', 'fr_FR')
+    assert [json.loads(line) for line in lines.splitlines()] == [
+        {'rule': 'FREQ=DAILY;COUNT=2', 'columns': ['1', 'FREQ=DAILY;COUNT=2'],
+         'description': 'Tous les jours seulement 2 fois'},
+        {'rule': 'FREQ=YEARLY', 'columns': ['2', 'FREQ=YEARLY'],
+         'description': 'Tous les ans'}]
+
+
+def test_empty(tmp_path):
+    assert run(tmp_path, '', '--mmap') == ''
+
+
+@pytest.mark.parametrize('args', ([], ['--mmap'], ['--jobs', '2']))
+def test_invalid(tmp_path, capsys, args):
+    source, target = tmp_path / 'rules', tmp_path / 'descriptions'
+    source.write_bytes(
+        b'a\tFREQ=DAILY\n\nb\tFREQ=NEVER\nc\ne\tFREQ=WEEKLY\xff\n'
+        b'd\tFREQ=YEARLY\n')
+    with pytest.raises(SystemExit) as exit:
+        main([str(source), '--output', str(target), '--column', '2'] + args)
+    assert exit.value.code == 1
+    assert target.read_text() == (
+        'a\tFREQ=DAILY\tEvery day\nd\tFREQ=YEARLY\tEvery year\n')
+    assert capsys.readouterr().err == (
+        "rrule34: line 3: invalid rule: invalid 'FREQ': NEVER\n"
+        'rrule34: line 4: missing rule column\n'
+        'rrule34: line 5: not UTF-8\n')
+
+
+def test_invalid_options(tmp_path, capsys):
+    for option in (['--jobs', '-1'], ['--chunksize', '0']):
+        with pytest.raises(SystemExit) as exit:
+            run(tmp_path, 'FREQ=DAILY\n', *option)
+        assert exit.value.code == 2
+    assert '--jobs cannot be negative' in capsys.readouterr().err
+
+
+def test_stdin():
+    process = subprocess.run(
+        [sys.executable, '-m', 'rrule34', '--format', 'jsonl'],
+        input=b'FREQ=MONTHLY;INTERVAL=2\n', stdout=subprocess.PIPE,
+        check=True)
+    assert json.loads(process.stdout) == {
+        'rule': 'FREQ=MONTHLY;INTERVAL=2', 'description': 'Every 2 months'}
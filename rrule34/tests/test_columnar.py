@@ -0,0 +1,53 @@
+from io import BytesIO, StringIO
+
+from dateutil.rrule import DAILY, WEEKLY, rrule
+
+from ..columnar import DescriptionTable, format_table
+
+RULES = [
+    'FREQ=WEEKLY;BYDAY=MO', 'FREQ=DAILY', 'FREQ=WEEKLY;BYDAY=MO',
+    rrule(freq=DAILY), rrule(freq=WEEKLY, byweekday=0)] * 3
+
+
+def test_format_table():
+    table = format_table(RULES)
+    assert table.strings == ['Every week on Monday', 'Every day']
+    assert table.indices.typecode == 'I'
+    assert list(table.indices) == [0, 1, 0, 1, 0] * 3
+    assert len(table) == 15 and table[1] == 'Every day'
+    assert list(table) == [
+        'Every week on Monday', 'Every day', 'Every week on Monday',
+        'Every day', 'Every week on Monday'] * 3
+
+
+def test_format_table_parallel():
+    table = format_table(RULES, 'fr_FR', max_workers=2, chunksize=4)
+    assert table.strings == ['Toutes les semaines le lundi', 'Tous les jours']
+    assert list(table.indices) == [0, 1, 0, 1, 0] * 3
+
+
+def test_text_writers():
+    table = DescriptionTable(['a, "b"', 'c', 'a, "b"'])
+    strings, indices = StringIO(), StringIO()
+    table.write_csv(strings, indices)
+    assert strings.getvalue() == 'id,description\n0,"a, ""b"""\n1,c\n'
+    assert indices.getvalue() == '0\n1\n0\n'
+    strings, indices = StringIO(), StringIO()
+    table.write_jsonl(strings, indices)
+    assert strings.getvalue() == (
+        '{"id": 0, "description": "a, \\"b\\""}\n'
+        '{"id": 1, "description": "c"}\n')
+    assert indices.getvalue() == '0\n1\n0\n'
+
+
+def test_binary():
+    table = DescriptionTable(['Tous les jours', 'Été', 'Été'] * 1000)
+    output = BytesIO()
+    table.write_binary(output)
+    assert len(output.getvalue()) == 8 + 8 + 4 + 14 + 4 + 5 + 4 * 3000
+    output.seek(0)
+    read = DescriptionTable.read_binary(output)
+    assert read.strings == ['Tous les jours', 'Été']
+    assert read.indices == table.indices
+    read.append('Été')
+    assert read.indices[-1] == 1
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from random import Random
+
+import pytest
+from dateutil.rrule import (
+    DAILY, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY, rrule)
+from pytz import timezone
+
+from ..counting import count_occurrences
+from ..parsing import parse_rrule_string
+
+SPANS = {
+    YEARLY: 20000, MONTHLY: 3000, WEEKLY: 2000, DAILY: 1000, HOURLY: 60,
+    MINUTELY: 3, SECONDLY: .1}
+
+
+def random_rule(random):
+    freq = random.choice(sorted(SPANS))
+    dtstart = datetime(2020, 1, 1) + timedelta(
+        days=random.randrange(800), seconds=random.randrange(86400))
+    kwargs = dict(
+        freq=freq, interval=random.choice((1, 1, 2, 3, 7)), dtstart=dtstart)
+    if random.random() < .3:
+        kwargs['count'] = random.randrange(1, 500)
+    else:
+        kwargs['until'] = dtstart + timedelta(
+            days=random.random() * SPANS[freq])
+    by = random.randrange(5)
+    if by == 1:
+        kwargs['byhour'] = random.sample(range(24), 2)
+    elif by == 2:
+        kwargs['byweekday'] = random.sample(range(7), 2)
+        kwargs['byminute'] = random.sample(range(60), 2)
+    elif by == 3:
+        kwargs['bymonthday'] = random.choice((1, 15, 31, -1))
+    elif by == 4:
+        kwargs.update(bysetpos=1, byhour=(3, 4))
+    try:
+        return rrule(**kwargs)
+    except ValueError:  # Impossible by-hours for the interval
+        return random_rule(random)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_count_matches_dateutil(seed):
+    random = Random(seed)
+    rr = random_rule(random)
+    occurrences = list(rr)
+    assert count_occurrences(rr) == len(occurrences)
+    after = random.choice(occurrences) if occurrences else rr._dtstart
+    assert count_occurrences(rr, after) == len(
+        [dt for dt in occurrences if dt > after])
+    assert count_occurrences(rr, after, inc=True) == len(
+        [dt for dt in occurrences if dt >= after])
+
+
+def test_count_long_spans():
+    start, end = datetime(2000, 1, 1), datetime(2100, 1, 1)
+    assert count_occurrences(rrule(SECONDLY, dtstart=start, until=end)) == (
+        (end - start).days * 86400 + 1)
+    # Working hours for a century, at one minute steps
+    assert count_occurrences(rrule(
+        MINUTELY, dtstart=start, until=end, byhour=range(9, 17),
+        byweekday=range(5))) == 26089 * 8 * 60
+    assert count_occurrences(rrule(
+        MONTHLY, dtstart=datetime(2000, 1, 31), until=end)) == 700
+
+
+def test_count_unbounded_and_aware():
+    assert count_occurrences(rrule(DAILY)) is None
+    paris = timezone('Europe/Paris')
+    rr = rrule(
+        HOURLY, dtstart=paris.localize(datetime(2020, 3, 28)),
+        until=paris.localize(datetime(2020, 3, 30)))
+    assert count_occurrences(rr) == len(list(rr))
+    rr = parse_rrule_string('FREQ=WEEKLY;COUNT=3;UNTIL=20000101')
+    with pytest.warns(DeprecationWarning):  # Both count and until
+        assert count_occurrences(rr) == 0
+
+
+def test_record_occurrence_numbers():
+    record = parse_rrule_string('FREQ=MONTHLY;BYDAY=+1MO,-1FR;UNTIL=20301225')
+    assert count_occurrences(record) == len(list(record.to_rrule()))
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from random import Random
+
+import pytest
+from dateutil.rrule import DAILY, FR, HOURLY, MONTHLY, WEEKLY, YEARLY, rrule
+from pytz import timezone
+
+numpy = pytest.importorskip('numpy')
+
+from ..expansion import expand, expand_many, supported  # noqa
+
+DTSTART = datetime(2019, 12, 30, 9, 15, 20)
+
+
+def as_datetimes(occurrences):
+    return occurrences.astype('datetime64[us]').tolist()
+
+
+def random_rule(random):
+    freq = random.choice((YEARLY, MONTHLY, WEEKLY, DAILY))
+    kwargs = dict(
+        freq=freq, interval=random.choice((1, 1, 2, 3, 5)),
+        dtstart=DTSTART + timedelta(
+            days=random.randrange(-20000, 3000),
+            seconds=random.randrange(86400)),
+        wkst=random.randrange(7))
+    fields = random.sample(
+        ('bymonth', 'bymonthday', 'byweekday', 'byhour', 'byminute',
+         'bysecond'), random.randrange(4))
+    if 'bymonth' in fields:
+        kwargs['bymonth'] = random.sample(range(1, 13), random.randrange(1, 4))
+    if 'bymonthday' in fields:
+        kwargs['bymonthday'] = random.sample(
+            [day for day in range(-31, 32) if day], random.randrange(1, 4))
+    if 'byweekday' in fields:
+        kwargs['byweekday'] = random.sample(range(7), random.randrange(1, 4))
+    if 'byhour' in fields:
+        kwargs['byhour'] = random.sample(range(24), random.randrange(1, 3))
+    if 'byminute' in fields:
+        kwargs['byminute'] = random.sample(range(60), random.randrange(1, 3))
+    if 'bysecond' in fields:
+        kwargs['bysecond'] = random.sample(range(60), random.randrange(1, 3))
+    end = random.randrange(3)
+    if end == 1:
+        kwargs['count'] = random.randrange(1, 200)
+    elif end == 2:
+        kwargs['until'] = kwargs['dtstart'] + timedelta(
+            days=random.randrange(4000))
+    return rrule(**kwargs)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_expand_matches_dateutil(seed):
+    random = Random(seed)
+    rr = random_rule(random)
+    assert supported(rr)
+    assert as_datetimes(expand(rr, limit=150)) == list(islice(rr, 150))
+
+    after = rr._dtstart + timedelta(days=random.randrange(-100, 2000))
+    before = after + timedelta(days=random.randrange(1, 800))
+    inc = random.random() < .5
+    if inc and rr._count is None:
+        # Bounds on an occurrence
+        after = rr.after(after) or after
+        before = rr.before(before) or before
+    assert as_datetimes(expand(rr, after, before, inc)) == rr.between(
+        after, before, inc)
+    assert as_datetimes(expand(rr, after=after, inc=inc, limit=20)) == list(
+        islice((dt for dt in rr if dt > after or inc and dt == after), 20))
+
+
+def test_expand_edges():
+    # Never happens: no 30th of February
+    rr = rrule(YEARLY, dtstart=DTSTART, bymonth=2, bymonthday=30)
+    assert len(expand(rr, limit=1)) == 0
+    rr = rrule(MONTHLY, dtstart=datetime(2000, 1, 31), count=7)
+    assert as_datetimes(expand(rr)) == list(rr)
+    assert expand(rr, limit=0).dtype == numpy.dtype('datetime64[us]')
+    with pytest.raises(ValueError):
+        expand(rrule(DAILY, dtstart=DTSTART))
+
+
+@pytest.mark.parametrize('rr', (
+    rrule(MONTHLY, dtstart=DTSTART, byweekday=0, bysetpos=-1, count=30),
+    rrule(YEARLY, dtstart=DTSTART, byweekno=(1, 20), count=30),
+    rrule(HOURLY, dtstart=DTSTART, interval=5, count=30),
+    rrule(MONTHLY, dtstart=DTSTART, byweekday=FR(-1), count=30),
+))
+def test_expand_fallback(rr):
+    assert not supported(rr)
+    assert as_datetimes(expand(rr)) == list(rr)
+
+
+def test_expand_aware_fallback():
+    paris = timezone('Europe/Paris')
+    rr = rrule(DAILY, dtstart=paris.localize(DTSTART), count=3)
+    assert not supported(rr)
+    assert as_datetimes(expand(rr)) == [
+        datetime(2019, 12, 30, 8, 15, 20) + timedelta(days=day)
+        for day in range(3)]
+
+
+def test_expand_many():
+    rules = [rrule(WEEKLY, dtstart=DTSTART, count=count) for count in (1, 2)]
+    assert [len(occurrences) for occurrences in expand_many(rules)] == [1, 2]
+
+
+def test_records():
+    from ..parsing import parse_rrule_string
+
+    record = parse_rrule_string('FREQ=MONTHLY;BYDAY=+1MO,-1FR;COUNT=6')
+    assert not supported(record)
+    assert as_datetimes(expand(record)) == list(record.to_rrule())
+    record = parse_rrule_string('FREQ=WEEKLY;BYDAY=MO,TU;COUNT=6')
+    assert supported(record)
+    assert as_datetimes(expand(record)) == list(record.to_rrule())
@@ -1,10 +1,12 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from dateutil.rrule import (
     DAILY, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY, rrule,
     rruleset)
+from pytz import timezone
 
-from rrule34.formatting import format_rrule, format_rruleset
+from rrule34.formatting import (
+    format_rrule, format_rrules, format_rruleset, format_rrulesets)
 
 
 def rr(include_start_date=False, date_verbosity='full', **rr):
@@ -13,10 +15,11 @@ def rr(include_start_date=False, date_verbosity='full', **rr):
         include_start_date=include_start_date, date_verbosity=date_verbosity)
 
 
-def rrs(rrs, include_start_date=False, date_verbosity='full'):
+def rrs(rrs, include_start_date=False, date_verbosity='full', **kwargs):
     return format_rruleset(
         rrs, locale='en_US',
-        include_start_date=include_start_date, date_verbosity=date_verbosity)
+        include_start_date=include_start_date, date_verbosity=date_verbosity,
+        **kwargs)
 
 
 def test_every_rrules():
@@ -129,3 +132,112 @@ def test_rrule_set():
         'Friday, May 15, 2015 at 3:50:25 PM, except '
         'every day on Tuesday and Saturday and except on '
         'Monday, April 14, 2014 at 2:40:24 PM')
+
+
+def test_format_rrules():
+    descriptions = format_rrules((
+        rrule(freq=DAILY),
+        rrule(freq=WEEKLY, interval=2),
+        rrule(freq=YEARLY, bymonth=3),
+    ), locale='en_US')
+    assert not isinstance(descriptions, list)
+    assert list(descriptions) == [
+        'Every day', 'Every 2 weeks', 'Every year on March']
+
+
+def test_format_rrulesets():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=SECONDLY))
+    rrset.rrule(rrule(freq=MONTHLY))
+    assert list(format_rrulesets(
+        [rruleset(), rrset], locale='en_US', include_start_date=False)) == [
+            '', 'Every second and every month']
+
+
+def test_every_until_verbosities():
+    until = datetime(2030, 12, 25, 11, 25)
+    assert rr(freq=YEARLY, until=until, date_verbosity='long') == (
+        'Every year until December 25, 2030 at 11:25:00 AM')
+    assert rr(freq=YEARLY, until=until, date_verbosity='medium') == (
+        'Every year until Dec 25, 2030, 11:25:00 AM')
+
+
+def test_every_since_aware():
+    paris = timezone('Europe/Paris')
+    assert rr(
+        include_start_date=True,
+        freq=DAILY, dtstart=paris.localize(datetime(2000, 7, 2, 12))) == (
+            'Every day since Sunday, July 2, 2000 at 12:00:00 PM '
+            'Central European Summer Time')
+    assert rr(
+        include_start_date=True, date_verbosity='long',
+        freq=DAILY, dtstart=paris.localize(datetime(2000, 1, 2, 12))) == (
+            'Every day since January 2, 2000 at 12:00:00 PM +0100')
+
+
+def test_rrule_set_summary():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=WEEKLY))
+    for day in (1, 2, 3, 4, 10):
+        rrset.exdate(datetime(2015, 5, day, 10))
+    for day in (1, 3, 5, 7):
+        rrset.exdate(datetime(2015, 6, day, 10))
+    rrset.rdate(datetime(2015, 7, 1, 10))
+    rrset.rdate(datetime(2015, 7, 1, 10))
+
+    assert rrs(rrset, date_verbosity='short', max_dates=3) == (
+        'Every week, on 7/1/15, 10:00 AM, except every day from '
+        '5/1/15, 10:00 AM to 5/4/15, 10:00 AM, except on 5/10/15, 10:00 AM, '
+        'except on 6/1/15, 10:00 AM and except on 3 more dates')
+    assert rrs(rrset, date_verbosity='short', group_dates='month') == (
+        'Every week, on 7/1/15, 10:00 AM, except on 5 dates in May 2015 '
+        'and except on 4 dates in June 2015')
+    assert rrs(
+        rrset, date_verbosity='short', group_dates='year', max_dates=0) == (
+        'Every week, on 1 more date and except on 9 more dates')
+
+
+def test_rrule_set_summary_split_runs():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=WEEKLY))
+    for month, day in ((5, 10), (5, 30), (5, 31), (6, 1), (6, 2), (6, 5)):
+        rrset.exdate(datetime(2015, month, day, 10))
+    assert rrs(rrset, group_dates='month') == (
+        'Every week, except on 3 dates in May 2015 '
+        'and except on 3 dates in June 2015')
+    rrset = rruleset()
+    for day in (20, 30, 31):
+        rrset.rdate(datetime(2014, 12, day, 10))
+    for day in (1, 2, 10):
+        rrset.rdate(datetime(2015, 1, day, 10))
+    assert rrs(rrset, group_dates='year') == (
+        'On 3 dates in 2014 and on 3 dates in 2015')
+
+
+def test_rrule_set_summary_is_bounded():
+    rrset = rruleset()
+    for day in range(5000):
+        rrset.exdate(datetime(2000, 1, 1, 10) + timedelta(days=2 * day))
+    assert rrs(rrset, group_dates='month', max_dates=2) == (
+        'Except on 16 dates in January 2000, except on 14 dates in '
+        'February 2000 and except on 4,970 more dates')
+
+
+def test_occurrences():
+    until = datetime(2020, 12, 31)
+    assert format_rrule(
+        rrule(freq=WEEKLY, dtstart=datetime(2020, 1, 1), until=until),
+        'en_US', 'short', occurrences=True) == (
+            'Every week until 12/31/20, 12:00 AM (53 occurrences)')
+    assert format_rrule(
+        rrule(
+            freq=MINUTELY, dtstart=datetime(2020, 1, 1), until=until,
+            byhour=9),
+        date_verbosity='short', occurrences=True,
+        after=datetime(2020, 12, 30, 9, 30)) == (
+            'Every minute until 12/31/20, 12:00 AM '
+            '(29 occurrences remaining)')
+    # Count only rules already give their number of occurrences
+    assert format_rrule(rrule(freq=DAILY, count=3), occurrences=True) == (
+        'Every day only 3 times')
+    assert format_rrule(rrule(freq=DAILY), occurrences=True) == 'Every day'
@@ -1,10 +1,13 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
+from babel.numbers import format_decimal
 from dateutil.rrule import (
     DAILY, HOURLY, MINUTELY, MONTHLY, SECONDLY, WEEKLY, YEARLY, rrule,
     rruleset)
+from pytz import timezone
 
-from ..formatting import format_rrule, format_rruleset
+from ..formatting import (
+    format_rrule, format_rrules, format_rruleset, format_rrulesets)
 
 
 def rr(include_start_date=False, date_verbosity='full', **rr):
@@ -13,10 +16,11 @@ def rr(include_start_date=False, date_verbosity='full', **rr):
         include_start_date=include_start_date, date_verbosity=date_verbosity)
 
 
-def rrs(rrs, include_start_date=False, date_verbosity='full'):
+def rrs(rrs, include_start_date=False, date_verbosity='full', **kwargs):
     return format_rruleset(
         rrs, locale='fr_FR',
-        include_start_date=include_start_date, date_verbosity=date_verbosity)
+        include_start_date=include_start_date, date_verbosity=date_verbosity,
+        **kwargs)
 
 
 def test_every_rrules():
@@ -127,3 +131,75 @@ def test_rrule_set():
         'vendredi 15 mai 2015 à 15:50:25, sauf '
         'tous les jours le mardi et samedi et sauf le '
         'lundi 14 avril 2014 à 14:40:24')
+
+
+def test_format_rrules():
+    descriptions = format_rrules((
+        rrule(freq=DAILY),
+        rrule(freq=WEEKLY, interval=2),
+        rrule(freq=YEARLY, bymonth=3),
+    ), locale='fr_FR')
+    assert not isinstance(descriptions, list)
+    assert list(descriptions) == [
+        'Tous les jours', 'Toutes les 2 semaines', 'Tous les ans en mars']
+
+
+def test_format_rrulesets():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=SECONDLY))
+    rrset.rrule(rrule(freq=MONTHLY))
+    assert list(format_rrulesets(
+        [rruleset(), rrset], locale='fr_FR', include_start_date=False)) == [
+            '', 'Toutes les secondes et tous les mois']
+
+
+def test_every_until_verbosities():
+    until = datetime(2030, 12, 25, 11, 25)
+    assert rr(freq=YEARLY, until=until, date_verbosity='long') == (
+        'Tous les ans jusqu’au 25 décembre 2030 à 11:25:00')
+    assert rr(freq=YEARLY, until=until, date_verbosity='medium') == (
+        'Tous les ans jusqu’au 25 déc. 2030 à 11:25:00')
+
+
+def test_every_since_aware():
+    paris = timezone('Europe/Paris')
+    assert rr(
+        include_start_date=True,
+        freq=DAILY, dtstart=paris.localize(datetime(2000, 7, 2, 12))) == (
+            'Tous les jours depuis le dimanche 2 juillet 2000 à 12:00:00 '
+            'heure d’été d’Europe centrale')
+    assert rr(
+        include_start_date=True, date_verbosity='long',
+        freq=DAILY, dtstart=paris.localize(datetime(2000, 1, 2, 12))) == (
+            'Tous les jours depuis le 2 janvier 2000 à 12:00:00 +0100')
+
+
+def test_rrule_set_summary():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=WEEKLY))
+    for day in (1, 2, 3, 4, 10):
+        rrset.exdate(datetime(2015, 5, day, 10))
+    for day in range(0, 3000, 2):
+        rrset.exdate(datetime(2015, 6, 1, 10) + timedelta(days=day))
+    rrset.rdate(datetime(2015, 7, 1, 10))
+
+    assert rrs(rrset, date_verbosity='short', max_dates=2) == (
+        'Toutes les semaines, le 01/07/2015 10:00, sauf tous les jours du '
+        '01/05/2015 10:00 au 04/05/2015 10:00, sauf le 10/05/2015 10:00 '
+        'et sauf %s autres dates' % format_decimal(1500, locale='fr_FR'))
+    assert rrs(rrset, group_dates='year', max_dates=1) == (
+        'Toutes les semaines, le mercredi 1 juillet 2015 à 10:00:00, '
+        'sauf 112 dates en 2015 et sauf %s autres dates' % format_decimal(
+            1393, locale='fr_FR'))
+
+
+def test_occurrences():
+    until = datetime(2020, 12, 31)
+    assert format_rrule(
+        rrule(freq=WEEKLY, dtstart=datetime(2020, 1, 1), until=until),
+        'fr_FR', 'short', occurrences=True) == (
+            'Toutes les semaines jusqu’au 31/12/2020 00:00 (53 occurrences)')
+    assert format_rrule(
+        rrule(freq=DAILY, dtstart=datetime(2020, 1, 1), count=12), 'fr_FR',
+        occurrences=True, after=datetime(2020, 1, 11)) == (
+            'Tous les jours seulement 12 fois (1 occurrence restante)')
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+# Cumulative import time budget of rrule34.formatting, in microseconds
+IMPORT_TIME_BUDGET = 50000
+
+
+def import_times(module):
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_heavy_imports_are_deferred():
+    times = import_times('rrule34.formatting')
+    assert not [
+        name for name in times
+        if name.split('.')[0] in ('babel', 'dateutil', 'pytz')]
+
+
+def test_import_time_budget():
+    # Best of three runs, to absorb noise from a busy machine
+    assert min(
+        import_times('rrule34.formatting')['rrule34.formatting']
+        for _ in range(3)) < IMPORT_TIME_BUDGET
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, rrule, rruleset
+
+from ..formatting import format_rruleset
+from ..incremental import RulesetFormatter
+from ..instrumentation import instrumented
+
+DTSTART = datetime(2020, 1, 6, 10)
+
+
+def test_incremental_matches_format_rruleset():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=WEEKLY, dtstart=DTSTART, byweekday=(0, 2)))
+    rrset.rdate(DTSTART + timedelta(days=1))
+    formatter = RulesetFormatter(rrset, 'fr_FR', 'short')
+
+    formatter.exdate(DTSTART + timedelta(days=7))
+    formatter.exrule(rrule(freq=MONTHLY, dtstart=DTSTART, bymonthday=1))
+    formatter.rdate(DTSTART + timedelta(days=3))
+    formatter.rrule(rrule(freq=DAILY, dtstart=DTSTART, count=3))
+    formatter.remove_rdate(DTSTART + timedelta(days=1))
+    assert formatter.format() == format_rruleset(
+        rrset, 'fr_FR', 'short') == (
+            'Toutes les semaines depuis le 06/01/2020 10:00 le lundi et '
+            'mercredi, tous les jours depuis le 06/01/2020 10:00 seulement 3 '
+            'fois, le 09/01/2020 10:00, sauf tous les mois depuis le '
+            '06/01/2020 10:00 le 1er jour du mois et sauf le 13/01/2020 10:00')
+    assert len(rrset._rrule) == 2 and len(rrset._rdate) == 1
+
+    for kind in ('rrule', 'exrule', 'exdate', 'rdate'):
+        getattr(formatter, 'remove_' + kind)(getattr(rrset, '_' + kind)[0])
+    assert str(formatter) == format_rruleset(rrset, 'fr_FR', 'short') == (
+        'Tous les jours depuis le 06/01/2020 10:00 seulement 3 fois')
+
+
+def test_incremental_renders_changes_only():
+    formatter = RulesetFormatter(include_start_date=False)
+    for day in range(1000):
+        formatter.exdate(DTSTART + timedelta(days=day))
+    formatter.format()
+    with instrumented() as stats:
+        formatter.exdate(DTSTART - timedelta(days=1))
+        formatter.remove_exdate(DTSTART)
+        formatter.rrule(rrule(freq=DAILY))
+        description = formatter.format()
+    assert stats.as_dict()['en_US']['format_dt']['calls'] == 1
+    assert description == format_rruleset(
+        formatter.rruleset, include_start_date=False)
+    assert description.startswith(
+        'Every day, except on Tuesday, January 7, 2020 at 10:00:00 AM, ')
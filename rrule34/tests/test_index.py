@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from random import Random
+
+import pytest
+from dateutil.rrule import (
+    DAILY, HOURLY, MINUTELY, MONTHLY, WEEKLY, YEARLY, rrule, rruleset)
+from dateutil.tz import gettz
+
+from ..index import IntervalTreap, RuleIndex
+
+START = datetime(2020, 1, 1)
+
+
+def random_rule(random):
+    freq = random.choice((YEARLY, MONTHLY, WEEKLY, DAILY, HOURLY, MINUTELY))
+    kwargs = dict(
+        freq=freq, interval=random.choice((1, 2, 5)),
+        dtstart=START + timedelta(
+            days=random.randrange(-30, 30), minutes=random.randrange(1440)))
+    # Long minutely rules are too slow to check with dateutil
+    end = 1 if freq == MINUTELY else random.randrange(3)
+    if end == 1:
+        kwargs['count'] = random.randrange(1, 50)
+    elif end == 2:
+        kwargs['until'] = kwargs['dtstart'] + timedelta(
+            days=random.randrange(60))
+    if random.random() < .5 and freq < HOURLY:
+        kwargs['byhour'] = random.sample(range(24), 2)
+    if random.random() < .3:
+        kwargs['byweekday'] = random.sample(range(7), 3)
+    if random.random() < .3 and freq < MINUTELY:
+        kwargs['byminute'] = random.sample(range(60), 2)
+    return rrule(**kwargs)
+
+
+def random_ruleset(random):
+    rrs = rruleset()
+    for _ in range(random.randrange(2)):
+        rrs.rrule(random_rule(random))
+    for _ in range(random.randrange(3)):
+        rrs.rdate(START + timedelta(minutes=random.randrange(60 * 24 * 30)))
+    if random.random() < .5:
+        rrs.exrule(random_rule(random))
+    for occurrence in list(rrs.between(START, START + timedelta(days=2)))[:3]:
+        rrs.exdate(occurrence)
+    return rrs
+
+
+def test_interval_treap():
+    random = Random(0)
+    treap = IntervalTreap()
+    intervals = {}
+    handles = []
+    for key in range(2000):
+        start = random.randrange(1000)
+        intervals[key] = start, start + random.randrange(50)
+        handles.append(treap.insert(start, intervals[key][1], key))
+    for key in range(0, 2000, 3):
+        treap.remove(handles[key])
+        del intervals[key]
+    assert len(treap) == len(intervals)
+    for start in range(0, 1100, 7):
+        assert sorted(treap.overlapping(start, start + 5)) == sorted(
+            key for key, (first, last) in intervals.items()
+            if first <= start + 5 and last >= start)
+    with pytest.raises(KeyError):
+        treap.remove(handles[0])
+
+
+def test_rule_index():
+    random = Random(1)
+    rules = {
+        key: random_ruleset(random) if key % 4 == 0 else random_rule(random)
+        for key in range(200)}
+    index = RuleIndex(rules.items())
+    for key in range(0, 200, 5):
+        index.remove(key)
+        del rules[key]
+    assert len(index) == len(rules)
+    for _ in range(20):
+        start = START + timedelta(minutes=random.randrange(60 * 24 * 40))
+        end = start + timedelta(minutes=random.choice((0, 15, 90, 2000)))
+        assert sorted(index.query(start, end)) == sorted(
+            key for key, rule in rules.items()
+            if rule.between(start, end, inc=True))
+        candidates = index.query(start, end, exact=False)
+        assert len(candidates) == len(set(candidates))
+
+
+def test_rule_index_aware():
+    paris = gettz('Europe/Paris')
+    index = RuleIndex()
+    index.add('daily', rrule(
+        DAILY, dtstart=datetime(2020, 1, 1, 9, tzinfo=paris)))
+    index.add('daily', rrule(
+        DAILY, dtstart=datetime(2020, 1, 1, 10, tzinfo=paris)))
+    start = datetime(2020, 6, 1, 9, 55, tzinfo=paris)
+    assert index.query(start, start + timedelta(minutes=15)) == ['daily']
+    assert index.query(start, start + timedelta(minutes=4)) == []
+    assert 'daily' in index
+
+
+def test_rule_index_mixed():
+    paris = gettz('Europe/Paris')
+    index = RuleIndex([
+        ('naive', rrule(DAILY, dtstart=datetime(2020, 1, 1, 9))),
+        ('naive until', rrule(
+            DAILY, dtstart=datetime(2020, 1, 1, 9),
+            until=datetime(2020, 12, 31))),
+        ('aware', rrule(
+            DAILY, dtstart=datetime(2020, 1, 1, 9, tzinfo=paris))),
+        ('aware count', rrule(
+            DAILY, dtstart=datetime(2020, 1, 1, 9, tzinfo=paris),
+            count=400)),
+    ])
+    # 9:00 in Paris is 7:00 UTC in summer
+    start = datetime(2020, 6, 1, 6, 55)
+    assert sorted(index.query(start, start + timedelta(minutes=10))) == [
+        'aware', 'aware count']
+    start = start.replace(tzinfo=paris) + timedelta(hours=2)
+    assert sorted(index.query(start, start + timedelta(minutes=10))) == [
+        'aware', 'aware count', 'naive', 'naive until']
+    index.remove('aware count')
+    index.remove('aware')
+    assert sorted(index.query(start, start + timedelta(minutes=10))) == [
+        'naive', 'naive until']
+
+
+def test_rule_index_prunes():
+    index = RuleIndex(
+        (minute, rrule(DAILY, dtstart=START + timedelta(minutes=minute)))
+        for minute in range(0, 1440, 5))
+    index.add('weekly', rrule(
+        WEEKLY, dtstart=START, until=START + timedelta(days=6)))
+    start = START + timedelta(days=3, hours=10)
+    assert sorted(index.candidates(start, start + timedelta(minutes=15))) == [
+        600, 605, 610, 615]
+    assert index.query(START, START + timedelta(minutes=4)) == [
+        'weekly', 0]
+    index.remove('weekly')
+    assert index.query(START, START + timedelta(minutes=4)) == [0]
+
+
+def test_records():
+    from ..index import _rule_slots
+    from ..parsing import parse_rrule_string
+
+    record = parse_rrule_string('FREQ=DAILY;BYHOUR=9;BYMINUTE=30')
+    assert _rule_slots(record) == {570}
+    index = RuleIndex([('daily', record), ('monthly', parse_rrule_string(
+        'FREQ=MONTHLY;BYDAY=+1MO;BYHOUR=9;BYMINUTE=30'))])
+    start = record._dtstart.replace(
+        hour=9, minute=0, second=0) + timedelta(days=1)
+    assert 'daily' in index.query(start, start + timedelta(hours=1))
+    assert index.query(start, start + timedelta(minutes=20)) == []
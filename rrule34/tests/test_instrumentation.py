@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from dateutil.rrule import DAILY, WEEKLY, rrule, rruleset
+from pytest import raises
+
+from ..formatting import en_US, format_rrule, format_rruleset
+from ..instrumentation import StageStats, disable, enable, instrumented
+
+
+def test_instrumented_stages():
+    rr = rrule(
+        freq=WEEKLY, dtstart=datetime(2000, 1, 2), byweekday=(0, 2), count=3)
+    with instrumented() as stats:
+        format_rrule(rr, include_start_date=True)
+        format_rrule(rr, locale='fr_FR')
+    stats = stats.as_dict()
+    assert {
+        stage: values['calls'] for stage, values in stats['en_US'].items()
+    } == {'every': 1, 'since': 1, 'format_dt': 1, 'by': 1, 'count': 1}
+    assert set(stats['fr_FR']) == {'every', 'by', 'count'}
+    assert stats['en_US']['since']['time'] >= (
+        stats['en_US']['format_dt']['time'])
+
+
+def test_instrumented_hook():
+    calls = []
+    rrs = rruleset()
+    rrs.rrule(rrule(freq=DAILY))
+    rrs.exdate(datetime(2014, 4, 14, 14, 40, 24))
+    with instrumented(lambda *args: calls.append(args[:2])):
+        format_rruleset(rrs, include_start_date=False)
+    # Ruleset dates are formatted in bulk, once for rdates and for exdates
+    assert calls == [
+        ('en_US', 'every'), ('en_US', 'format_dt'), ('en_US', 'format_dt')]
+
+
+def test_disable_restores_methods():
+    every = en_US.every
+    format_dt = en_US.format_dt
+    enable(StageStats())
+    with raises(RuntimeError):
+        enable(StageStats())
+    assert en_US.every is not every
+    disable()
+    assert en_US.every is every
+    assert en_US.format_dt is format_dt
+    assert 'format_dt' not in en_US.__dict__
@@ -0,0 +1,57 @@
+import sys
+from datetime import datetime, timedelta
+
+from dateutil.rrule import DAILY, rrule, rruleset
+from pytest import mark
+
+from ..formatting import format_rruleset
+from ..instrumentation import measure_memory
+
+START = datetime(2000, 1, 3, 12)
+# Peak bytes and blocks left allocated by format_rruleset, recorded with
+# CPython 3.9, babel 2.4.0 and dateutil 2.6.1
+BUDGETS = {
+    ('en_US', 10): (3465, 5),
+    ('en_US', 1000): (188908, 7),
+    ('en_US', 100000): (18435425, 8),
+    ('fr_FR', 10): (3680, 5),
+    ('fr_FR', 1000): (200810, 5),
+    ('fr_FR', 100000): (19702918, 18),
+}
+PEAK_TOLERANCE = 1.05
+BLOCKS_TOLERANCE = 4
+
+
+def sample_ruleset(dates):
+    """Return a ruleset of a daily rule and ``dates`` hourly dates.
+
+    A tenth as many dates, half an hour later, are excluded.
+    """
+    rrs = rruleset()
+    rrs.rrule(rrule(freq=DAILY, dtstart=START, count=3))
+    for hour in range(dates):
+        rrs.rdate(START + timedelta(hours=hour))
+    for hour in range(0, dates, 10):
+        rrs.exdate(START + timedelta(hours=hour, minutes=30))
+    return rrs
+
+
+def test_measure_memory():
+    result, stats = measure_memory(lambda: [object() for _ in range(1000)])
+    assert len(result) == 1000
+    assert stats.peak >= stats.size >= 1000 * 16
+    assert 1001 <= stats.blocks <= 1010
+
+
+@mark.parametrize('locale', ('en_US', 'fr_FR'))
+@mark.parametrize('dates', (10, 1000, 100000))
+def test_ruleset_memory_budget(locale, dates):
+    rrs = sample_ruleset(dates)
+    # Caches are filled out of the measure
+    format_rruleset(rrs, locale)
+    description, stats = measure_memory(format_rruleset, rrs, locale)
+    peak, blocks = BUDGETS[locale, dates]
+    assert stats.peak <= peak * PEAK_TOLERANCE
+    # Only the description is left
+    assert stats.blocks <= blocks + BLOCKS_TOLERANCE
+    assert stats.size < sys.getsizeof(description) + 4096
@@ -0,0 +1,35 @@
+from dateutil.rrule import DAILY, WEEKLY, rrule, rruleset
+
+from ..parallel import format_bulk, iformat_bulk
+
+
+def test_format_bulk_strings():
+    rules = ['FREQ=DAILY', 'FREQ=WEEKLY;BYDAY=MO,WE', 'FREQ=MONTHLY;COUNT=3']
+    assert format_bulk(rules * 5, chunksize=2, max_workers=2) == [
+        'Every day', 'Every week on Monday and Wednesday',
+        'Every month only 3 times'] * 5
+
+
+def test_format_bulk_specs():
+    rrset = rruleset()
+    rrset.rrule(rrule(freq=DAILY))
+    assert format_bulk([
+        {'freq': WEEKLY, 'interval': 2}, rrule(freq=DAILY), rrset,
+    ], locale='fr_FR', include_start_date=False, max_workers=1) == [
+        'Toutes les 2 semaines', 'Tous les jours', 'Tous les jours']
+
+
+def test_iformat_bulk_is_lazy():
+    rules = ('FREQ=DAILY;INTERVAL=%d' % i for i in range(1, 1000))
+    descriptions = iformat_bulk(rules, chunksize=10, max_workers=2)
+    assert next(descriptions) == 'Every day'
+    assert next(descriptions) == 'Every 2 days'
+    descriptions.close()
+
+
+def test_iformat_bulk_exceptions():
+    descriptions = list(iformat_bulk(
+        ['FREQ=DAILY', 'FREQ=NEVER'], max_workers=1,
+        return_exceptions=True))
+    assert descriptions[0] == 'Every day'
+    assert isinstance(descriptions[1], ValueError)
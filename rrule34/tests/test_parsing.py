@@ -0,0 +1,79 @@
+import pytest
+from dateutil.rrule import rrule, rruleset, rrulestr
+
+from ..formatting import format_rrule, format_rrule_string
+from ..parsing import RuleRecord, parse_rrule_string
+
+RULES = (
+    'FREQ=DAILY',
+    'FREQ=WEEKLY;BYDAY=MO,WE',
+    'RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=WE,MO;WKST=SU',
+    'freq=monthly;bymonthday=3,-1,1;count=12',
+    'FREQ=MONTHLY;BYDAY=+1MO,-1FR;BYSETPOS=1,-2',
+    'FREQ=YEARLY;BYMONTH=12,3;BYWEEKNO=12,1;BYYEARDAY=100,12',
+    'FREQ=YEARLY;BYEASTER=-2,1;UNTIL=20301225',
+    'FREQ=DAILY;BYHOUR=9,17;BYMINUTE=30;UNTIL=20301225T112500',
+    'FREQ=SECONDLY;INTERVAL=15',
+)
+
+
+def test_parse_rrule_string_record():
+    record = parse_rrule_string('FREQ=WEEKLY;BYDAY=WE,MO;COUNT=3')
+    assert isinstance(record, RuleRecord)
+    assert (record._freq, record._interval, record._count) == (2, 1, 3)
+    assert record._original_rule == {'byweekday': (0, 2)}
+
+
+def test_parse_rrule_string_fallback():
+    assert isinstance(parse_rrule_string(
+        'DTSTART:20000102T120000\nRRULE:FREQ=DAILY'), rrule)
+    assert isinstance(parse_rrule_string(
+        'FREQ=DAILY;UNTIL=20301225T112500Z'), rrule)
+    assert isinstance(parse_rrule_string(
+        'RRULE:FREQ=DAILY\nRDATE:20150515T155025'), rruleset)
+
+
+def test_parse_rrule_string_validation():
+    # Rules are accepted or rejected as dateutil does
+    for rule in (
+            'FREQ=WEEKLY;BYDAY=MO,MO', 'FREQ=MONTHLY;BYDAY=+1MO,MO',
+            'FREQ=MONTHLY;BYDAY=-1FR,-1FR;BYSETPOS=-366'):
+        assert parse_rrule_string(rule)._original_rule == (
+            rrulestr(rule)._original_rule)
+    for rule in (
+            'FREQ=MONTHLY;BYDAY=MO;BYSETPOS=0',
+            'FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1,367',
+            'FREQ=MONTHLY;BYDAY=+0MO'):
+        with pytest.raises(ValueError):
+            rrulestr(rule)
+        with pytest.raises(ValueError):
+            parse_rrule_string(rule)
+
+
+def test_format_rrule_string():
+    for locale in ('en_US', 'fr_FR'):
+        for rule in RULES:
+            assert format_rrule_string(rule, locale) == format_rrule(
+                rrulestr(rule), locale), rule
+
+
+def test_format_rrule_string_fallback():
+    assert format_rrule_string(
+        'DTSTART:20000102T120000\nRRULE:FREQ=DAILY',
+        include_start_date=True) == (
+            'Every day since Sunday, January 2, 2000 at 12:00:00 PM')
+    assert format_rrule_string(
+        'RRULE:FREQ=DAILY\nRDATE:20150515T155025',
+        include_start_date=False) == (
+            'Every day and on Friday, May 15, 2015 at 3:50:25 PM')
+
+
+def test_record_to_rrule():
+    record = parse_rrule_string(
+        'FREQ=MONTHLY;BYDAY=+1MO,-1FR,WE;COUNT=5;INTERVAL=2')
+    assert record._original_rule == {'byweekday': (0, 2, 4)}
+    rule = record.to_rrule()
+    assert isinstance(rule, rrule)
+    assert list(rule) == list(rrulestr(
+        'FREQ=MONTHLY;BYDAY=+1MO,-1FR,WE;COUNT=5;INTERVAL=2',
+        dtstart=record._dtstart))
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+from pytz import timezone
+
+import rrule34
+
+from ..formatting import Lang, get_formatter
+
+
+def test_warmup():
+    paris = timezone('Europe/Paris')
+    formatters = rrule34.warmup(
+        ['fr_FR'], verbosities=['full'], timezones=[paris])
+    assert formatters == [get_formatter('fr_FR', 'full')]
+    lang, = formatters
+    assert sorted(lang.zone_names.values()) == [
+        ('heure d’été d’Europe centrale',),
+        ('heure normale d’Europe centrale',)]
+    assert len(lang.plans) >= 16
+    assert {'babel.numbers', 'dateutil.rrule'} <= set(sys.modules)
+
+
+def test_warmup_defaults():
+    formatters = rrule34.warmup()
+    assert len(formatters) == 4 * len(Lang.languages)
+
+
+def test_warmup_before_fork():
+    # Workers forked after a warmup find every formatter ready
+    code = '\n'.join((
+        'import os, rrule34',
+        'from rrule34.formatting import Lang',
+        'rrule34.warmup(["en_US"], ["full"], freeze=True)',
+        'if os.fork() == 0:',
+        '    assert ("en_US", "full") in Lang.formatters',
+        '    os._exit(0)',
+        'assert os.wait()[1] == 0'))
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from babel.dates import format_datetime
+from dateutil.rrule import DAILY, WEEKLY, YEARLY, rrule
+from pytest import fixture, raises
+from pytz import timezone
+
+from ..formatting import Lang, en_US, fr_FR, get_formatter
+from ..instrumentation import instrumented
+
+
+def test_get_formatter_is_shared():
+    assert get_formatter() is get_formatter('en_US', 'full')
+    assert isinstance(get_formatter('fr_FR', 'short'), fr_FR)
+    assert get_formatter('en_US', 'short') is not get_formatter('en_US')
+    assert get_formatter('en_US', 'short').date_verbosity == 'short'
+
+
+def test_formatter_is_immutable():
+    lang = get_formatter()
+    with raises(AttributeError):
+        lang.date_verbosity = 'short'
+    with raises(AttributeError):
+        lang.anything = None
+
+
+def test_formatter_verbosity_does_not_leak():
+    rr = rrule(freq=DAILY, until=datetime(2030, 12, 25, 11, 25))
+    lang = Lang.formatter('en_US')
+    assert lang.format_rrule(rr, date_verbosity='short') == (
+        'every day until 12/25/30, 11:25 AM')
+    assert lang.format_rrule(rr) == (
+        'every day until Wednesday, December 25, 2030 at 11:25:00 AM')
+    assert isinstance(Lang['en_US'], en_US)
+
+
+def test_formatter_threads():
+    rules = [
+        rrule(freq=DAILY, until=datetime(2030, 12, 25, 11, 25)),
+        rrule(freq=DAILY, until=datetime(2031, 1, 1))]
+    verbosities = ['full', 'short'] * 50
+
+    def render(index):
+        lang = get_formatter('fr_FR', verbosities[index])
+        return lang.format_rrule(rules[index % 2])
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(render, range(len(verbosities))))
+    assert results == [
+        'tous les jours jusqu’au mercredi 25 décembre 2030 à 11:25:00',
+        'tous les jours jusqu’au 01/01/2031 00:00'] * 50
+
+
+def test_formatter_zone_names():
+    paris = timezone('Europe/Paris')
+    lang = get_formatter('en_US', 'full')
+    lang.zone_names.clear()
+    for month in (1, 7, 1, 7):
+        dt = paris.localize(datetime(2015, month, 1, 12))
+        assert lang.format_dt(dt) == format_datetime(
+            dt, 'full', locale='en_US')
+    assert sorted(lang.zone_names.values()) == [
+        ('Central European Standard Time',),
+        ('Central European Summer Time',)]
+
+
+GERMAN = {
+    'frequencies': {'DAILY': ('Tag', None, 'Tage'), 'YEARLY': 'Jahr'},
+    'every': ('jeden %s', 'alle %s %s'),
+    'and': ' und ',
+}
+
+
+@fixture
+def registry():
+    saved = [
+        (registry, dict(registry)) for registry in (
+            Lang.languages, Lang.loaders, Lang.resolved, Lang.formatters)]
+    yield
+    for registry, content in saved:
+        registry.clear()
+        registry.update(content)
+
+
+def test_fallbacks():
+    assert list(Lang.fallbacks('fr_CA')) == ['fr_CA', 'fr', 'fr_FR', 'en_US']
+    assert list(Lang.fallbacks('de-CH')) == ['de_CH', 'de', 'en_US']
+    assert Lang.resolve('fr_CA') is fr_FR
+    assert get_formatter('fr_CA', 'short') is get_formatter('fr_FR', 'short')
+    assert get_formatter('de_CH') is get_formatter('en_US')
+    assert isinstance(Lang['de_DE'], en_US)
+
+
+def test_catalog(registry):
+    assert Lang.resolve('de_CH') is en_US
+    Lang.register('de', 'rrule34.tests.test_registry:GERMAN')
+    assert 'de' not in Lang.languages
+    lang = get_formatter('de_CH')
+    assert lang is get_formatter('de') and isinstance(lang, en_US)
+    assert 'de' in Lang.languages and 'de' in Lang.available()
+    assert lang.format_rrule(rrule(freq=DAILY, interval=2)) == 'alle 2 Tage'
+    assert lang.format_rrule(rrule(freq=YEARLY, byweekday=(0, 1))) == (
+        'jeden Jahr on Montag und Dienstag')
+
+
+def test_partial_catalog(registry):
+    Lang.register('de', dict(GERMAN, ordinals={1: '%d.'}))
+    lang = get_formatter('de')
+    assert lang.format_rrule(rrule(freq=WEEKLY)) == 'jeden week'
+    assert lang.format_rrule(rrule(freq=WEEKLY, interval=2)) == (
+        'alle 2 weeks')
+    assert lang.nth(1) == '1.' and lang.nth(2) == '2nd'
+    assert en_US.PHRASES['ordinals'][1] == '%dst'
+
+
+def test_instrumented_catalog(registry):
+    Lang.register('de', GERMAN)
+    with instrumented() as stats:
+        get_formatter('de').format_rrule(rrule(freq=DAILY, count=2))
+        get_formatter('en_US').format_rrule(rrule(freq=DAILY))
+    stats = stats.as_dict()
+    assert set(stats['de']) == {'every', 'count'}
+    assert stats['en_US']['every']['calls'] == 1
+
+
+def test_register_class(registry):
+    Lang.register('fr_BE', fr_FR)
+    lang = get_formatter('fr_BE', 'short')
+    assert lang.__class__.__name__ == 'fr_BE' and isinstance(lang, fr_FR)
+    assert lang.format_rrule(rrule(freq=DAILY, count=1)) == (
+        'tous les jours seulement 1 fois')
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from ..service import DescriptionService, serve
+
+
+def test_coalescing_and_batching():
+    async def describe_all():
+        async with DescriptionService(
+                ThreadPoolExecutor(1), batch_delay=.05) as service:
+            descriptions = await asyncio.gather(*[
+                service.describe('FREQ=DAILY;INTERVAL=%d' % (i % 5 + 1))
+                for i in range(50)] + [service.describe(
+                    'FREQ=WEEKLY', 'fr_FR', include_start_date=False)])
+            return descriptions, service.stats()
+
+    descriptions, stats = asyncio.run(describe_all())
+    assert descriptions[:6] == [
+        'Every day', 'Every 2 days', 'Every 3 days', 'Every 4 days',
+        'Every 5 days', 'Every day']
+    assert descriptions[-1] == 'Toutes les semaines'
+    assert stats['requests'] == 51
+    assert stats['coalesced'] == 45
+    assert stats['batches'] == 1 and stats['mean_batch_size'] == 6
+    assert stats['in_flight'] == stats['queue_depth'] == 0
+    assert set(stats['latency']) == {'p50', 'p90', 'p99', 'max'}
+
+
+def test_errors():
+    async def describe():
+        async with DescriptionService(ThreadPoolExecutor(1)) as service:
+            try:
+                await service.describe('FREQ=NEVER')
+            except ValueError as exception:
+                return str(exception), service.stats()['errors']
+
+    assert asyncio.run(describe()) == (
+        'ValueError: invalid \'FREQ\': NEVER', 1)
+
+
+def test_rejected_requests():
+    async def describe(*args, **kwargs):
+        async with DescriptionService(ThreadPoolExecutor(1)) as service:
+            try:
+                await service.describe('FREQ=DAILY', *args, **kwargs)
+            except (TypeError, ValueError) as exception:
+                return str(exception), service.stats()['requests']
+
+    assert asyncio.run(describe('xx_XX')) == ("Unknown locale: 'xx_XX'", 0)
+    assert asyncio.run(describe('en_US', 'EEEE')) == (
+        "Unknown date verbosity: 'EEEE'", 0)
+    assert asyncio.run(describe(count=3)) == ('Unknown options: count', 0)
+    assert asyncio.run(describe(include_start_date='yes')) == (
+        'include_start_date must be a boolean', 0)
+
+
+def test_broken_executor():
+    async def describe():
+        async with DescriptionService(ThreadPoolExecutor(1)) as service:
+            service.executor.shutdown()
+            for rule in ('FREQ=DAILY', 'FREQ=WEEKLY'):
+                try:
+                    await asyncio.wait_for(service.describe(rule), 5)
+                except ValueError as exception:
+                    error = str(exception)
+            return error, service.stats()
+
+    error, stats = asyncio.run(describe())
+    assert error.startswith('RuntimeError: cannot schedule new futures')
+    assert stats['errors'] == 2 and stats['in_flight'] == 0
+
+
+def test_backpressure():
+    async def describe_all():
+        async with DescriptionService(
+                ThreadPoolExecutor(1), batch_size=4, max_queue=8,
+                max_batches=1) as service:
+            descriptions = await asyncio.gather(*[
+                service.describe('FREQ=DAILY;INTERVAL=%d' % (i + 1))
+                for i in range(100)])
+            return descriptions, service.stats()
+
+    descriptions, stats = asyncio.run(describe_all())
+    assert descriptions[:2] == ['Every day', 'Every 2 days']
+    assert descriptions[-1] == 'Every 100 days'
+    assert stats['max_queue_depth'] <= 8
+    assert stats['in_flight'] == stats['queue_depth'] == 0
+
+
+def test_unix_server(tmp_path):
+    path = str(tmp_path / 'rrule34.sock')
+
+    async def client():
+        server = asyncio.ensure_future(serve(
+            DescriptionService(max_workers=1, locales=['en_US']), path))
+        for _ in range(100):
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                break
+            except (ConnectionRefusedError, FileNotFoundError):
+                await asyncio.sleep(.05)
+        writer.writelines([
+            b'{"rule": "FREQ=MONTHLY;BYMONTHDAY=1"}\n', b'not json\n',
+            b'{"rule": "FREQ=YEARLY", "locale": "fr_FR"}\n',
+            b'{"stats": true}\n'])
+        writer.write_eof()
+        replies = [
+            json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+        return replies
+
+    replies = asyncio.run(client())
+    assert replies[0] == {'description': 'Every month the 1 of month'}
+    assert replies[1]['error'].startswith('JSONDecodeError')
+    assert replies[2] == {'description': 'Tous les ans'}
+    assert replies[3]['stats']['requests'] == 2
+
+
+def test_pipelined_client(tmp_path):
+    path = str(tmp_path / 'rrule34.sock')
+
+    async def client():
+        server = asyncio.ensure_future(serve(DescriptionService(
+            ThreadPoolExecutor(1), max_queue=4, pipeline=8), path))
+        for _ in range(100):
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                break
+            except (ConnectionRefusedError, FileNotFoundError):
+                await asyncio.sleep(.05)
+        tasks = []
+
+        async def count_tasks():
+            while True:
+                tasks.append(len(asyncio.all_tasks()))
+                await asyncio.sleep(.001)
+
+        counting = asyncio.ensure_future(count_tasks())
+        # Every request is sent before any reply is read
+        writer.writelines(
+            b'{"rule": "FREQ=DAILY;INTERVAL=%d"}\n' % interval
+            for interval in range(1, 1001))
+        writer.write_eof()
+        replies = [
+            json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        counting.cancel()
+        server.cancel()
+        try:
+            await server
+        except asyncio.CancelledError:
+            pass
+        return replies, max(tasks)
+
+    replies, tasks = asyncio.run(client())
+    assert len(replies) == 1000
+    assert replies[-1] == {'description': 'Every 1000 days'}
+    assert tasks < 30
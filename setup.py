@@ -21,7 +21,9 @@ setup(
     platforms="Any",
     provides=['rrule34'],
     install_requires=["python-dateutil", "babel"],
+    extras_require={"numpy": ["numpy"]},
     tests_require=["pytest"],
+    entry_points={"console_scripts": ["rrule34 = rrule34.cli:main"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",